@@ -0,0 +1,283 @@
+# Кинематика точки, заданной в полярных координатах
+import hashlib
+import json
+import os
+import stat
+import warnings
+
+import numpy as np
+
+from common import diskcache
+
+
+# 1. Порядок вычисляемых величин и параметры вычислений
+COLUMNS = ('x', 'y', 'Vx', 'Vy', 'ax', 'ay', 'rx', 'ry')
+
+# Допустимое относительное расхождение ядра с поточечной подстановкой .subs
+KERNEL_TOL = 1e-9
+
+# Размер блока отсчетов, обрабатываемого слитным вычислителем за один проход
+BLOCK = 4096
+
+# Дисковый кэш выводов и ядер: каталог, предельный размер и версия формата.
+# Версию нужно увеличивать при любом изменении derive/generate_source.
+CACHE_DIR = os.environ.get('KINEMATICS_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'okmds', 'kinematics'))
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+CACHE_VERSION = 2
+
+
+# 2. Символьный вывод кинематических характеристик
+def derive(r_expr, phi_expr) -> dict:
+    # sympy импортируется только здесь: при попадании в кэш он не нужен вовсе
+    import sympy as sp
+    t = sp.Symbol('t')
+
+    # Переход от полярных координат к декартовым
+    x = r_expr * sp.cos(phi_expr)
+    y = r_expr * sp.sin(phi_expr)
+
+    # Скорость и ускорение - первая и вторая производные по времени
+    Vx = sp.diff(x, t)
+    Vy = sp.diff(y, t)
+    ax = sp.diff(Vx, t)
+    ay = sp.diff(Vy, t)
+
+    # Радиус кривизны и вектор к центру кривизны
+    V = sp.sqrt(Vx * Vx + Vy * Vy)
+    R = (V**3) / abs(Vx*ay - Vy*ax)
+    rx = R * (-Vy / V)
+    ry = R * (Vx / V)
+
+    return dict(zip(COLUMNS, (x, y, Vx, Vy, ax, ay, rx, ry)))
+
+
+# 3. Генерация слитного вычислителя с исключением общих подвыражений
+def generate_source(exprs: dict, params: tuple = ()) -> str:
+    import sympy as sp
+    from sympy.printing.numpy import NumPyPrinter
+
+    # Общие подвыражения (sin(t), cos(t), Vx, Vy, ...) вычисляются один раз для всех столбцов
+    replacements, reduced = sp.cse([exprs[name] for name in COLUMNS])
+    printer = NumPyPrinter()
+
+    lines = [f"def fused({', '.join(('t',) + tuple(params) + ('out',))}):"]
+    for symbol, value in replacements:
+        lines.append(f'    {symbol} = {printer.doprint(value)}')
+    for k, value in enumerate(reduced):
+        lines.append(f'    out[{k}][...] = {printer.doprint(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+# 4. Компиляция сгенерированного кода в векторизованное numpy-ядро
+def compile_source(source: str):
+    # Все столбцы вычисляются одной функцией сразу для всего массива времени
+    namespace = {'numpy': np}
+    exec(source, namespace)
+    fused = namespace['fused']
+
+    def kernel(T: np.ndarray, *params, out: np.ndarray = None) -> np.ndarray:
+        # Без параметров результат имеет форму (8,) + T.shape,
+        # с параметрами - (8, n_trajectories) + T.shape (параметры - одномерные массивы или числа)
+        T = np.asarray(T, dtype=float)
+        params = [np.asarray(p, dtype=float).reshape(-1, 1) for p in params]
+        n = np.broadcast_shapes((1, 1), *(p.shape for p in params))[0]
+        if out is None:
+            out = np.empty((len(COLUMNS),) + ((n,) if params else ()) + T.shape)
+        flat_T = T.reshape(1, -1)
+        flat_out = out.reshape(len(COLUMNS), n, -1)
+
+        # Расчет блоками, чтобы промежуточные массивы оставались в кэше процессора
+        n_samples = flat_T.shape[1]
+        rows = max(1, BLOCK // max(n_samples, 1))
+        cols = max(1, min(n_samples, BLOCK))
+        # В точке возврата (V = 0) радиус кривизны не определен - там будет nan/inf
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in range(0, n, rows):
+                block = [p[i:i + rows] if p.shape[0] > 1 else p for p in params]
+                for j in range(0, n_samples, cols):
+                    fused(flat_T[:, j:j + cols], *block, flat_out[:, i:i + rows, j:j + cols])
+        return out
+
+    return kernel
+
+
+def compile_kernel(exprs: dict, params: tuple = ()):
+    return compile_source(generate_source(exprs, params))
+
+
+# 5. Дисковый кэш: ключ - исходные выражения законов r(t) и phi(t)
+def cache_key(r_law: str, phi_law: str, params: tuple = ()) -> str:
+    # Пробелы не влияют на ключ, любое другое изменение законов дает новый ключ
+    laws = [CACHE_VERSION, ' '.join(r_law.split()), ' '.join(phi_law.split()), list(params)]
+    return hashlib.sha256(json.dumps(laws).encode()).hexdigest()
+
+
+def _trusted(path: str) -> bool:
+    # Записи кэша содержат исходный код, который исполняется через exec, поэтому кэш
+    # используется только если каталог (и файл) принадлежат текущему пользователю и
+    # недоступны для записи группе и остальным: иначе запись в кэш - выполнение кода
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return True
+    own = not hasattr(os, 'getuid') or info.st_uid == os.getuid()
+    return own and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def load(r_law: str, phi_law: str, params: tuple = (), cache_dir: str = CACHE_DIR,
+         max_bytes: int = CACHE_MAX_BYTES):
+    # Возвращает (выражения в виде строк, ядро); символьный вывод - только при промахе.
+    # params - имена параметров семейства законов, ядро принимает их после массива времени
+    params = tuple(params)
+    reserved = {'t', 'out', 'numpy'} & set(params)
+    if reserved:
+        raise ValueError(f'reserved parameter names: {sorted(reserved)}')
+    path = os.path.join(cache_dir, cache_key(r_law, phi_law, params) + '.json')
+    use_cache = _trusted(cache_dir) and _trusted(path)
+    if not use_cache:
+        warnings.warn(f'{cache_dir}: cache is writable by other users, not used')
+    try:
+        if use_cache:
+            with open(path) as f:
+                entry = json.load(f)
+            diskcache.touch(path)
+            return entry['exprs'], compile_source(entry['source'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    import sympy as sp
+    symbols = {name: sp.Symbol(name) for name in ('t',) + params}
+    exprs = derive(sp.sympify(r_law, locals=symbols), sp.sympify(phi_law, locals=symbols))
+    entry = {
+        'r': r_law,
+        'phi': phi_law,
+        'params': list(params),
+        'exprs': {name: str(exprs[name]) for name in COLUMNS},
+        'source': generate_source(exprs, params),
+    }
+
+    if use_cache:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        diskcache.atomic_write(path, lambda f: json.dump(entry, f), mode='w')
+        diskcache.evict(cache_dir, '.json', max_bytes)
+
+    return entry['exprs'], compile_source(entry['source'])
+
+
+# 6. Пакетный расчет семейства траекторий r(t; p), phi(t; p)
+def trajectories(r_law: str, phi_law: str, params: dict, T: np.ndarray) -> dict:
+    # params - словарь {имя: массив значений} одинаковой длины n_trajectories (или чисел).
+    # Возвращает словарь {величина: массив (n_trajectories, n_samples)} из COLUMNS
+    names = tuple(sorted(params))
+    _, kernel = load(r_law, phi_law, names)
+    out = kernel(T, *(params[name] for name in names))
+    return dict(zip(COLUMNS, out))
+
+
+# 7. Адаптивная выборка времени по кривизне траектории
+def _chord_deviation(P0: np.ndarray, P1: np.ndarray, Pm: np.ndarray) -> np.ndarray:
+    # Расстояние от точки Pm до отрезка P0-P1 (массивы формы (2, n))
+    d = P1 - P0
+    w = Pm - P0
+    dd = np.sum(d * d, axis=0)
+    u = np.clip(np.sum(w * d, axis=0) / np.where(dd > 0, dd, 1.0), 0.0, 1.0)
+    return np.hypot(*(w - u * d))
+
+
+# Доли интервала, в которых проверяется отклонение дуги от хорды, и запас по tol
+# на погрешность оценки вершины отклонения между этими точками
+CHECK_POINTS = np.arange(1, 16) / 16
+CHECK_MARGIN = 0.99
+
+
+def _max_deviation(kernel, T: np.ndarray, fractions=CHECK_POINTS) -> np.ndarray:
+    # Наибольшее отклонение дуги от хорды на каждом интервале [T[k], T[k + 1]]: по равноотстоящим
+    # долям fractions, вершина уточняется параболой через наибольшее значение и соседние
+    P = kernel(T)[:2]
+    D = np.zeros((len(fractions) + 2, len(T) - 1))  # на концах интервала отклонение равно нулю
+    for j, q in enumerate(fractions, start=1):
+        Pq = kernel(T[:-1] + q * np.diff(T))[:2]
+        D[j] = _chord_deviation(P[:, :-1], P[:, 1:], Pq)
+    cols = np.arange(D.shape[1])
+    k = np.clip(np.argmax(D, axis=0), 1, len(fractions))
+    left, mid, right = D[k - 1, cols], D[k, cols], D[k + 1, cols]
+    curvature = 2 * mid - left - right
+    with np.errstate(divide='ignore', invalid='ignore'):
+        peak = mid + np.where(curvature > 0, (right - left) ** 2 / (8 * curvature), 0.0)
+    return np.maximum(peak, mid)
+
+
+def _speed_minima(kernel, T: np.ndarray, V: np.ndarray, iterations: int = 60) -> np.ndarray:
+    # Моменты локальных минимумов скорости (точки возврата и близкие к ним): минимум на
+    # пробной сетке уточняется золотым сечением сразу для всех минимумов
+    i = np.flatnonzero((V[1:-1] <= V[:-2]) & (V[1:-1] < V[2:])) + 1
+    a, b = T[i - 1], T[i + 1]
+    ratio = (np.sqrt(5) - 1) / 2
+    for _ in range(iterations):
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        Vc = np.hypot(*kernel(c)[2:4])
+        Vd = np.hypot(*kernel(d)[2:4])
+        left = Vc < Vd
+        b = np.where(left, d, b)
+        a = np.where(left, a, c)
+    return (a + b) / 2
+
+
+def adaptive_times(kernel, t0: float, t1: float, tol: float = 1e-3,
+                   n_probe: int = 1024, max_samples: int = 200000) -> np.ndarray:
+    # Неравномерная сетка времени, на которой ломаная отклоняется от траектории не более чем на tol.
+    # Сначала отсчеты распределяются по плотности V / sqrt(8 R tol): хорда длины ds на дуге
+    # радиуса R отходит от нее на ds^2 / (8 R). Минимумы скорости (точки возврата, где R -> 0
+    # и острие легко проскочить между проверочными точками) всегда входят в сетку.
+    # Затем интервалы, где дуга все же отходит от хорды дальше tol, делятся пополам
+    T = np.linspace(t0, t1, n_probe)
+    cols = kernel(T)
+    V = np.hypot(cols[2], cols[3])
+    R = np.hypot(cols[6], cols[7])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        density = V / np.sqrt(8 * R * tol)
+    finite = np.isfinite(density)
+    density = np.where(finite, density, np.max(density[finite], initial=0.0))
+    minima = _speed_minima(kernel, T, V)
+
+    # Обращение накопленного числа отсчетов дает начальную сетку
+    counts = np.concatenate(([0.0], np.cumsum((density[1:] + density[:-1]) / 2 * np.diff(T))))
+    if counts[-1] > 0:
+        n = int(min(np.ceil(counts[-1]) + 1, max_samples))
+        T = np.interp(np.linspace(0, counts[-1], n), counts, T)
+    else:
+        T = np.array([t0, t1], dtype=float)
+    T = np.unique(np.concatenate((T, minima)))
+
+    # Уточнение по фактическому отклонению дуги от хорды внутри интервалов
+    while len(T) < max_samples:
+        deviation = _max_deviation(kernel, T)
+        Tm = (T[:-1] + T[1:]) / 2
+        bad = np.flatnonzero(deviation > CHECK_MARGIN * tol)
+        if bad.size == 0:
+            break
+        bad = bad[:max_samples - len(T)]
+        T = np.insert(T, bad + 1, Tm[bad])
+    return T
+
+
+# 8. Проверка ядра по поточечной подстановке sympy
+def check_kernel(kernel, exprs: dict, T: np.ndarray, tol: float = KERNEL_TOL) -> float:
+    # Возвращает максимальное относительное расхождение, при превышении tol - ошибка.
+    # Неконечные значения (радиус кривизны в точке возврата) допустимы только там, где
+    # они получаются и у подстановки; любое другое nan/inf считается расхождением
+    import sympy as sp
+    t = sp.Symbol('t')
+
+    T = np.asarray(T, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fast = kernel(T)
+    slow = np.array([[complex(sp.sympify(exprs[name]).subs(t, ti)).real for ti in T] for name in COLUMNS])
+    finite = np.isfinite(slow)
+    if np.any(np.isfinite(fast) != finite):
+        raise ValueError('kernel mismatch: non-finite values where the substitution is finite (or vice versa)')
+    scale = np.maximum(np.abs(slow[finite]), 1.0)
+    err = float(np.max(np.abs(fast[finite] - slow[finite]) / scale, initial=0.0))
+    if not err <= tol:
+        raise ValueError(f'kernel mismatch: {err:.3e} > {tol:.1e}')
+    return err
@@ -1,27 +1,30 @@
 # 0. Импорт необходимых библиотек
 import math
-import sympy as sp
+import os
+import sys
 import matplotlib.pyplot as plot
 import numpy as np
 from matplotlib.animation import FuncAnimation
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import cli, export, playback
+
+import kinematics
+
+ARGS = cli.parse_args()  # до создания фигур: при экспорте включается Agg
+
 
 # 1. Указание параметров моделирования
-STEPS = 1000
+CHORD_TOL = 1e-4  # допустимое отклонение ломаной от траектории (для кардиоиды - 587 отсчетов)
 TIP_LENGTH = 0.15
 TIP_WIDTH = 0.1
 START_VALUE = 0
 END_VALUE = 2 * math.pi
 
 
-# 2. Определение параметрических функций для движения точки
-def r(t: float) -> float:
-    # Функция радиус-вектора материальной точки от времени
-    return 1 + sp.sin(t)
-
-def phi(t: float) -> float:
-    # Функция угла материальной точки от времени
-    return t
+# 2. Законы движения точки в полярных координатах (выражения от времени t)
+R_LAW = '1 + sin(t)'  # радиус-вектор материальной точки
+PHI_LAW = 't'  # угол материальной точки
 
 # 2.5 Функция поворота двумерной ДСК
 def rot2D(X: np.ndarray, Y: np.ndarray, phi: float):
@@ -31,57 +34,20 @@ def rot2D(X: np.ndarray, Y: np.ndarray, phi: float):
     return X_r, Y_r
 
 
-# 3. Создание символьной переменной времени
-t = sp.Symbol('t')
-
-# 4. Переход от полярных координат к декартовым
-x = r(t) * sp.cos(phi(t))  # x-координата
-y = r(t) * sp.sin(phi(t))  # y-координата
-
-# 5. Вычисление кинематических характеристик
-# Скорость - первая производная по времени
-Vx = sp.diff(x, t)  # Проекция скорости на ось x
-Vy = sp.diff(y, t)  # Проекция скорости на ось y
-
-# Ускорение - вторая производная по времени
-ax = sp.diff(Vx, t)  # Проекция ускорения на ось x
-ay = sp.diff(Vy, t)  # Проекция ускорения на ось y
-
-# 6. Вычисление радиуса кривизны
-V = sp.sqrt(Vx * Vx + Vy * Vy)  # Модуль скорости
-R = (V**3) / abs(Vx*ay - Vy*ax)  # Радиус кривизны траектории 
-# Пояснение к R: (V_x^2 + V_y^3)^{3/2} / (V_x * a_y - V_y * a_x)
-
-# Вычисление нормального вектора
-nx = -Vy / V
-ny = Vx / V
-
-# Вектор к центру кривизны (нормальный вектор на радиус)
-rx = R * nx
-ry = R * ny
-
-# 7. Создание массивов для числовых расчетов
-T = np.linspace(START_VALUE, END_VALUE, STEPS)  # Массив значений времени
-# Инициализация массивов для хранения значений
-X = np.zeros_like(T)  # x-координаты
-Y = np.zeros_like(T)  # y-координаты
-VX = np.zeros_like(T)  # x-компоненты скорости
-VY = np.zeros_like(T)  # y-компоненты скорости
-AX = np.zeros_like(T)  # x-компоненты ускорения
-AY = np.zeros_like(T)  # y-компоненты ускорения
-RX = np.zeros_like(T)  # x-компоненты радиуса кривизны
-RY = np.zeros_like(T)  # y-компоненты радиуса кривизны
-
-# 8. Вычисление значений для каждого момента времени
-for i in range(len(T)):
-    X[i] = x.subs(t, T[i])
-    Y[i] = y.subs(t, T[i])
-    VX[i] = 0.5 * Vx.subs(t, T[i])  # Масштабирование для визуализации
-    VY[i] = 0.5 * Vy.subs(t, T[i])
-    AX[i] = 0.2 * ax.subs(t, T[i])
-    AY[i] = 0.2 * ay.subs(t, T[i])
-    RX[i] = rx.subs(t, T[i])
-    RY[i] = ry.subs(t, T[i])
+# 3-7. Вывод кинематических характеристик и компиляция ядра.
+# Результат хранится в дисковом кэше, поэтому при повторном запуске
+# с теми же законами символьные вычисления (и импорт sympy) не выполняются
+exprs, kernel = kinematics.load(R_LAW, PHI_LAW)
+
+# 8. Вычисление всех величин сразу для всего массива времени
+# Массив значений времени: отсчеты сгущаются там, где велика кривизна
+T = kinematics.adaptive_times(kernel, START_VALUE, END_VALUE, CHORD_TOL)
+STEPS = len(T)  # число кадров определяется выборкой
+X, Y, VX, VY, AX, AY, RX, RY = kernel(T)
+VX *= 0.5  # Масштабирование для визуализации
+VY *= 0.5
+AX *= 0.2
+AY *= 0.2
 
 # 9. Настройка графика
 fgr = plot.figure()
@@ -90,63 +56,77 @@ grf.axis('equal')  # Одинаковый масштаб по осям
 grf.set(xlim=[-3, 3], ylim=[-2, 3])
 grf.plot(X, Y)  # Построение траектории
 
-# 10. Создание начальных элементов анимации
-Pnt = grf.plot(X[0], Y[0], marker='o')[0]  # Точка
-Vpl = grf.plot([X[0], X[0] + VX[0]], [Y[0], Y[0] + VY[0]], 'r')[0]  # Вектор скорости
-Apl = grf.plot([X[0], X[0] + AX[0]], [Y[0], Y[0] + AY[0]], 'g')[0]  # Вектор ускорения
-Rpl = grf.plot([X[0], X[0] + RX[0]], [Y[0], Y[0] + RY[0]], 'b')[0]  # Вектор радиуса кривизны
-
-
-# 11. Функция для создания стрелок векторов
+# 10. Функция для создания стрелок векторов (сразу для всех кадров)
 def vect_arrow(vec_x, vec_y, _x, _y):
     # Создание наконечника стрелки
     arr_x = np.array([-TIP_LENGTH, 0, -TIP_LENGTH])
     arr_y = np.array([TIP_WIDTH, 0, -TIP_WIDTH])
 
-    # Поворот наконечника
-    phi = math.atan2(vec_y, vec_x)
+    # Поворот наконечника: по строке из трех точек на каждый кадр
+    phi = np.arctan2(vec_y, vec_x)[:, None]
     rot_x, rot_y = rot2D(arr_x, arr_y, phi)
 
     # Перемещение наконечника в нужную позицию
-    arr_x = rot_x + _x + vec_x
-    arr_y = rot_y + _y + vec_y
+    arr_x = rot_x + (_x + vec_x)[:, None]
+    arr_y = rot_y + (_y + vec_y)[:, None]
 
     return arr_x, arr_y
 
 
-# 12. Создание начальных стрелок для векторов
-ArVX, ArVY = vect_arrow(VX[0], VY[0], X[0], Y[0])
-V_arr = grf.plot(ArVX, ArVY, 'r')[0]
-
-ArAX, ArAY = vect_arrow(AX[0], AY[0], X[0], Y[0])
-A_arr = grf.plot(ArAX, ArAY, 'g')[0]
+# 11. Предварительный расчет геометрии всех кадров: массивы формы (STEPS, 2) и (STEPS, 3)
+P_X = X[:, None]  # строка j - точка в кадре j
+P_Y = Y[:, None]
+V_X = np.stack([X, X + VX], axis=1)  # отрезки векторов
+V_Y = np.stack([Y, Y + VY], axis=1)
+A_X = np.stack([X, X + AX], axis=1)
+A_Y = np.stack([Y, Y + AY], axis=1)
+R_X = np.stack([X, X + RX], axis=1)
+R_Y = np.stack([Y, Y + RY], axis=1)
+ArVX, ArVY = vect_arrow(VX, VY, X, Y)  # наконечники стрелок
+ArAX, ArAY = vect_arrow(AX, AY, X, Y)
+ArRX, ArRY = vect_arrow(RX, RY, X, Y)
+
+# 12. Создание начальных элементов анимации
+Pnt = grf.plot(P_X[0], P_Y[0], marker='o')[0]  # Точка
+Vpl = grf.plot(V_X[0], V_Y[0], 'r')[0]  # Вектор скорости
+Apl = grf.plot(A_X[0], A_Y[0], 'g')[0]  # Вектор ускорения
+Rpl = grf.plot(R_X[0], R_Y[0], 'b')[0]  # Вектор радиуса кривизны
+V_arr = grf.plot(ArVX[0], ArVY[0], 'r')[0]
+A_arr = grf.plot(ArAX[0], ArAY[0], 'g')[0]
+R_arr = grf.plot(ArRX[0], ArRY[0], 'b')[0]
+
+
+# 13. Функция анимации: только выбор строк предрассчитанных массивов.
+# j - номер кадра или дробная позиция между кадрами: отсчеты T на прямых участках редки,
+# а отрезок между соседними точками отклоняется от траектории не больше чем на CHORD_TOL.
+# Для дробных позиций строки интерполируются в заранее выделенные буферы
+ROWS = (P_X, P_Y, V_X, V_Y, ArVX, ArVY, A_X, A_Y, ArAX, ArAY, R_X, R_Y, ArRX, ArRY)
+BUFFERS = [np.empty(values.shape[1]) for values in ROWS]
 
-ArRX, ArRY = vect_arrow(RX[0], RY[0], X[0], Y[0])
-R_arr = grf.plot(ArRX, ArRY, 'b')[0]
 
-# 13. Функция анимации
 def animate(j):
-    global ArVX, ArVY, ArAX, ArAY, ArRX, ArRY
-    # Обновление положения точки
-    Pnt.set_data([X[j]], [Y[j]])
-
-    # Обновление вектора скорости
-    Vpl.set_data([X[j], X[j] + VX[j]], [Y[j], Y[j] + VY[j]])
-    ArVX, ArVY = vect_arrow(VX[j], VY[j], X[j], Y[j])
-    V_arr.set_data(ArVX, ArVY)
-
-    # Обновление вектора ускорения
-    Apl.set_data([X[j], X[j] + AX[j]], [Y[j], Y[j] + AY[j]])
-    ArAX, ArAY = vect_arrow(AX[j], AY[j], X[j], Y[j])
-    A_arr.set_data(ArAX, ArAY)
-
-    # Обновление вектора радиуса кривизны
-    Rpl.set_data([X[j], X[j] + RX[j]], [Y[j], Y[j] + RY[j]])
-    ArRX, ArRY = vect_arrow(RX[j], RY[j], X[j], Y[j])
-    R_arr.set_data(ArRX, ArRY)
-
+    (px, py, vx, vy, avx, avy, ax, ay, aax, aay,
+     rx, ry, arx, ary) = [playback.lerp(values, j, out) for values, out in zip(ROWS, BUFFERS)]
+    Pnt.set_data(px, py)  # Обновление положения точки
+    Vpl.set_data(vx, vy)  # Обновление вектора скорости
+    V_arr.set_data(avx, avy)
+    Apl.set_data(ax, ay)  # Обновление вектора ускорения
+    A_arr.set_data(aax, aay)
+    Rpl.set_data(rx, ry)  # Обновление вектора радиуса кривизны
+    R_arr.set_data(arx, ary)
+
+    # Возвращаем только движущиеся элементы: траектория остается в кэшированном фоне
     return [Pnt, Vpl, V_arr, Apl, A_arr, Rpl, R_arr]
 
 # 14. Создание и запуск анимации
-an = FuncAnimation(fgr, animate, frames=STEPS, interval=1)
-plot.show()  # Отображение графика
+# Кадр выбирается по настенному времени: скорость не зависит от STEPS и скорости отрисовки;
+# между отсчетами положение интерполируется, поэтому при малой скорости движение плавное
+clock = playback.PlaybackClock(T, ARGS.speed, interpolate=True)
+fgr.canvas.mpl_connect('close_event', lambda event: print(clock.report()))
+an = FuncAnimation(fgr, animate, frames=clock.frames, interval=1, blit=True, cache_frame_data=False)
+if ARGS.export:  # сохранение кадров без дисплея
+    # Отсчеты T неравномерны, поэтому кадры берутся на равномерной сетке времени
+    positions = playback.uniform_positions(T, ARGS.fps, ARGS.speed)
+    export.export_animation(fgr, animate, positions, ARGS.export, ARGS.workers, ARGS.dpi, ARGS.fps)
+else:
+    plot.show()
@@ -0,0 +1,161 @@
+# Точные первая и вторая производные законов движения и разностная замена для таблиц
+import numpy as np
+
+
+# 1. Прямое автоматическое дифференцирование: струя (значение, f', f'')
+class Jet:
+    # Арифметика над струями переносит производные по правилам Лейбница и цепному,
+    # поэтому закон, записанный обычными формулами через sin/cos/exp/sqrt этого модуля,
+    # за один проход дает значение, скорость и ускорение. Компоненты - массивы numpy
+    __slots__ = ('v', 'd1', 'd2')
+    __array_ufunc__ = None  # ndarray + Jet передается в Jet.__radd__, а не numpy
+
+    def __init__(self, v, d1, d2):
+        self.v, self.d1, self.d2 = v, d1, d2
+
+    @classmethod
+    def variable(cls, t) -> 'Jet':
+        # Независимая переменная: t' = 1, t'' = 0
+        t = np.asarray(t, dtype=float)
+        return cls(t, np.ones_like(t), np.zeros_like(t))
+
+    def __add__(self, other):
+        if isinstance(other, Jet):
+            return Jet(self.v + other.v, self.d1 + other.d1, self.d2 + other.d2)
+        return Jet(self.v + other, self.d1, self.d2)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Jet(-self.v, -self.d1, -self.d2)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, Jet):
+            return Jet(self.v * other.v,
+                       self.d1 * other.v + self.v * other.d1,
+                       self.d2 * other.v + 2 * self.d1 * other.d1 + self.v * other.d2)
+        return Jet(self.v * other, self.d1 * other, self.d2 * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not isinstance(other, Jet):
+            return self * (1 / other)
+        q = self.v / other.v
+        q1 = (self.d1 - q * other.d1) / other.v
+        q2 = (self.d2 - 2 * q1 * other.d1 - q * other.d2) / other.v
+        return Jet(q, q1, q2)
+
+    def __rtruediv__(self, other):
+        return Jet(np.asarray(other, dtype=float), 0.0, 0.0) / self
+
+    def __pow__(self, p):
+        # Только постоянный показатель
+        return _chain(self, self.v ** p, p * self.v ** (p - 1), p * (p - 1) * self.v ** (p - 2))
+
+
+def _chain(u: Jet, f, df, ddf) -> Jet:
+    # f(u)' = f'(u) u',  f(u)'' = f''(u) u'^2 + f'(u) u''
+    return Jet(f, df * u.d1, ddf * u.d1 * u.d1 + df * u.d2)
+
+
+def sin(x):
+    if isinstance(x, Jet):
+        s, c = np.sin(x.v), np.cos(x.v)
+        return _chain(x, s, c, -s)
+    return np.sin(x)
+
+
+def cos(x):
+    if isinstance(x, Jet):
+        s, c = np.sin(x.v), np.cos(x.v)
+        return _chain(x, c, -s, -c)
+    return np.cos(x)
+
+
+def exp(x):
+    if isinstance(x, Jet):
+        e = np.exp(x.v)
+        return _chain(x, e, e, e)
+    return np.exp(x)
+
+
+def sqrt(x):
+    if isinstance(x, Jet):
+        s = np.sqrt(x.v)
+        return _chain(x, s, 0.5 / s, -0.25 / (s * s * s))
+    return np.sqrt(x)
+
+
+def differentiate(law, t):
+    # law(t) - закон, записанный через функции этого модуля; возвращает (f, f', f'')
+    result = law(Jet.variable(t))
+    if not isinstance(result, Jet):  # закон не зависит от t
+        return result, np.zeros_like(result), np.zeros_like(result)
+    return result.v, result.d1, result.d2
+
+
+# 2. Разностная замена для табличных данных
+def fornberg_weights(z: float, x: np.ndarray, order: int) -> np.ndarray:
+    # Веса разностной формулы производных порядков 0..order в точке z по узлам x
+    # (алгоритм Форнберга; узлы могут быть неравномерными). Форма (order + 1, len(x))
+    n = len(x)
+    c = np.zeros((order + 1, n))
+    c[0, 0] = 1.0
+    c1, c4 = 1.0, x[0] - z
+    for i in range(1, n):
+        mn = min(i, order)
+        c2, c5, c4 = 1.0, c4, x[i] - z
+        for j in range(i):
+            c3 = x[i] - x[j]
+            c2 *= c3
+            if j == i - 1:
+                for k in range(mn, 0, -1):
+                    c[k, i] = c1 * (k * c[k - 1, i - 1] - c5 * c[k, i - 1]) / c2
+                c[0, i] = -c1 * c5 * c[0, i - 1] / c2
+            for k in range(mn, 0, -1):
+                c[k, j] = (c4 * c[k, j] - k * c[k - 1, j]) / c3
+            c[0, j] = c4 * c[0, j] / c3
+        c1 = c2
+    return c
+
+
+def finite_difference(y, t, order: int = 1, accuracy: int = 6) -> np.ndarray:
+    # Производная порядка order табличной функции y(t) по последней оси с погрешностью
+    # O(h^accuracy): центральные формулы внутри, односторонние той же точности у краев.
+    # На равномерной сетке внутренние точки считаются одной векторной сверткой
+    y = np.asarray(y, dtype=float)
+    t = np.asarray(t, dtype=float)
+    n = len(t)
+    accuracy += accuracy % 2
+    width = 2 * ((order + 1) // 2) - 1 + accuracy  # центральная формула (нечетное число узлов)
+    half = width // 2
+    edge = accuracy + order  # односторонняя формула
+    if n < edge:
+        raise ValueError(f'order {order} with accuracy {accuracy} needs at least {edge} nodes, got {n}')
+    out = np.empty_like(y)
+
+    h = np.diff(t)
+    uniform = np.allclose(h, h[0], rtol=1e-9, atol=0)
+    if uniform and n > width:
+        weights = fornberg_weights(0.0, (np.arange(width) - half) * h[0], order)[order]
+        interior = out[..., half:n - half]
+        interior[...] = 0
+        for k, w in enumerate(weights):
+            interior += w * y[..., k:n - width + 1 + k]
+        edges = list(range(half)) + list(range(n - half, n))
+    else:
+        edges = range(n)
+
+    for i in edges:
+        size = width if half <= i < n - half else edge
+        start = min(max(i - size // 2, 0), n - size)
+        weights = fornberg_weights(t[i], t[start:start + size], order)[order]
+        out[..., i] = y[..., start:start + size] @ weights
+    return out
@@ -1,9 +1,18 @@
 # 0. Импортируем необходимые библиотеки
 import math
+import os
+import sys
 import numpy as np  # numpy для математических вычислений
 import matplotlib.pyplot as plot  # для создания графиков
 from matplotlib.animation import FuncAnimation  # для анимации
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import cli, export, playback
+
+import mechanism
+
+ARGS = cli.parse_args()  # до создания фигур: при экспорте включается Agg
+
 # 1. Создаем фигуру и оси для графика
 fgr = plot.figure()
 gr = fgr.add_subplot(1, 1, 1)
@@ -61,19 +70,33 @@ Yp = np.linspace(0, 1, 2 * NP + 1)  # y-координаты точек пруж
 Xp = 0.15 * np.sin(np.pi/2*np.arange(2 * NP + 1))  # x-координаты точек пружины
 Pruzh = gr.plot(XO + RB + Xp, (YO + y_r[0]) * Yp)[0]  # рисуем пружину
 
+# Координаты движущихся частей для всех кадров: функция кадра только выбирает строку
+GEOMETRY = mechanism.frame_geometry(Xa, Ya, y_r, Xb, Yb, XO, YO, RB, RS, Xc, Yc, Xp, Yp)
+m_X, m_Y = GEOMETRY['circle']
+AB_X, AB_Y = GEOMETRY['AB']
+L_X, L_Y = GEOMETRY['L']
+Pruzh_X, Pruzh_Y = GEOMETRY['spring']
+
 
 # 8. Функция обновления кадров анимации
 def run(i):
     # Обновляем положения всех движущихся элементов
-    m.set_data([Xa[i] + RS * Xc], [Ya[i] + RS * Yc])  # движение малого круга
-    AB.set_data([Xa[i], Xb], [Ya[i], Yb])  # движение стержня AB
-    L.set_data([XO + RB, XO + RB], [YO, YO + y_r[i]])  # движение вертикального стержня
-    Pruzh.set_data(XO + RB + Xp, (YO + y_r[i]) * Yp)  # движение пружины
+    m.set_data(m_X[i], m_Y[i])  # движение малого круга
+    AB.set_data(AB_X[i], AB_Y[i])  # движение стержня AB
+    L.set_data(L_X[i], L_Y[i])  # движение вертикального стержня
+    Pruzh.set_data(Pruzh_X[i], Pruzh_Y[i])  # движение пружины
 
-    return [m, AB, Block, Pruzh]
+    # Возвращаем только движущиеся элементы: блок и опоры остаются в кэшированном фоне
+    return [m, AB, L, Pruzh]
 
 # 9. Создаем анимацию
-anim = FuncAnimation(fgr, run, frames=STEPS, interval=1)  # interval=1 задает скорость анимации
+# Кадр выбирается по настенному времени: скорость не зависит от STEPS и скорости отрисовки
+clock = playback.PlaybackClock(t, ARGS.speed)
+fgr.canvas.mpl_connect('close_event', lambda event: print(clock.report()))
+anim = FuncAnimation(fgr, run, frames=clock.frames, interval=1, blit=True, cache_frame_data=False)  # interval=1 - частота опроса часов
 
 # Показываем результат
-plot.show()
+if ARGS.export:  # сохранение кадров без дисплея
+    export.export_animation(fgr, run, STEPS, ARGS.export, ARGS.workers, ARGS.dpi, ARGS.fps)
+else:
+    plot.show()
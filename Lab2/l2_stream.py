@@ -0,0 +1,135 @@
+# Потоковый режим l2_with_graphs.py: механизм показывается без заранее заданного конца,
+# состояния считаются порциями по мере продвижения времени, на графиках - последнее окно
+# 0. Импортируем необходимые библиотеки
+import math
+import os
+import sys
+import numpy as np  # numpy для математических вычислений
+import matplotlib.pyplot as plot  # для создания графиков
+from matplotlib.animation import FuncAnimation  # для анимации
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import cli, playback, ringbuffer
+
+import mechanism
+
+ARGS = cli.parse_args()
+if ARGS.export:
+    sys.exit('потоковый режим не имеет конца и не экспортируется; используйте l2_with_graphs.py --export')
+
+# 1. Создаем фигуру и оси для графика
+fgr = plot.figure(figsize=(9, 6))
+gs = fgr.add_gridspec(4, 2)
+gr = fgr.add_subplot(gs[:, 0])  # механизм занимает всю левую часть
+gr.axis('equal')
+
+# 2. Задаем основные параметры
+DT = 4 * math.pi / 1000  # шаг по времени (как в l2_with_graphs.py)
+CHUNK = mechanism.CHUNK  # отсчетов в одной порции
+WINDOW = 2 * math.pi  # длительность истории на графиках
+XO = 3  # x-координата центра блока
+YO = 4  # y-координата центра блока
+RB = 0.5  # радиус блока
+Y0 = 2.3  # начальная амплитуда
+RS = 0.1  # радиус малого круга
+SA = np.pi / 18  # Начальное отклонение
+NP = 20  # количество витков пружины
+DESIGN = {'SA': SA, 'Y0': Y0, 'RB': RB, 'XO': XO, 'YO': YO}
+
+# Координаты точек механизма
+Xb = XO - RB  # x-координата точки B
+Yb = YO  # y-координата точки B
+
+# 3. Рисуем неподвижные части механизма
+gr.plot([2, 4], [0, 0], 'black', linewidth=3)  # нижняя опора
+gr.plot([2, 4], [YO + 0.7, YO + 0.7], 'black', linewidth=3)  # верхняя опора
+gr.plot([XO - 0.1, XO, XO + 0.1], [YO + 0.7, YO, YO + 0.7], 'black')  # крепление
+
+# 4. Создаем движущиеся элементы по первой порции
+first = next(mechanism.stream(DT, 1, **DESIGN))
+AB = gr.plot([first['Xa'][0], Xb], [first['Ya'][0], Yb], 'green')[0]  # стержень AB
+L = gr.plot([XO + RB, XO + RB], [YO, YO + first['y_r'][0]], 'green')[0]  # вертикальный стержень
+
+Alp = np.linspace(0, 2 * np.pi, 100)  # углы для построения окружности
+Xc = np.cos(Alp)  # x-координаты точек окружности
+Yc = np.sin(Alp)  # y-координаты точек окружности
+Block = gr.plot(XO + RB * Xc, YO + RB * Yc, 'black')[0]  # основной блок
+m = gr.plot(first['Xa'][0] + RS * Xc, first['Ya'][0] + RS * Yc, 'black')[0]  # малый круг
+
+Yp = np.linspace(0, 1, 2 * NP + 1)  # y-координаты точек пружины
+Xp = 0.15 * np.sin(np.pi / 2 * np.arange(2 * NP + 1))  # x-координаты точек пружины
+Pruzh = gr.plot(XO + RB + Xp, (YO + first['y_r'][0]) * Yp)[0]  # рисуем пружину
+
+# 5. Создаем графики: по оси абсцисс - время относительно текущего момента
+vx_plot = fgr.add_subplot(gs[0, 1])  # скорость по x
+vy_plot = fgr.add_subplot(gs[1, 1])  # скорость по y
+ax_plot = fgr.add_subplot(gs[2, 1])  # ускорение по x
+ay_plot = fgr.add_subplot(gs[3, 1])  # ускорение по y
+
+vx_line, = vx_plot.plot([], [], 'b-', label='Vx')
+vy_line, = vy_plot.plot([], [], 'r-', label='Vy')
+ax_line, = ax_plot.plot([], [], 'g-', label='Ax')
+ay_line, = ay_plot.plot([], [], 'm-', label='Ay')
+
+for subplot in [vx_plot, vy_plot, ax_plot, ay_plot]:
+    subplot.grid(True)
+    subplot.legend()
+    subplot.set_xlim(-WINDOW, 0)
+
+vx_plot.set_ylabel('Скорость по X')
+vy_plot.set_ylabel('Скорость по Y')
+ax_plot.set_ylabel('Ускорение по X')
+ay_plot.set_ylabel('Ускорение по Y')
+ax_plot.set_xlabel('Время до текущего момента')
+ay_plot.set_xlabel('Время до текущего момента')
+
+# Пределы по одному периоду: законы движения периодичны с периодом 2π
+PERIOD = mechanism.point_A(np.arange(0, 2 * math.pi, DT), SA, Y0, RB, XO, YO)
+for subplot, name in ((vx_plot, 'vx'), (vy_plot, 'vy'), (ax_plot, 'ax'), (ay_plot, 'ay')):
+    subplot.set_ylim(np.min(PERIOD[name]) * 1.1, np.max(PERIOD[name]) * 1.1)
+
+# 6. Поток кадров: порция считается, когда до нее дошло время; история - кольцевой буфер
+HISTORY_FIELDS = ('t', 'vx', 'vy', 'ax', 'ay')
+history = ringbuffer.RingBuffer(int(WINDOW / DT) + 1, len(HISTORY_FIELDS))
+clock = playback.StreamClock(ARGS.speed)
+
+
+def frames():
+    # Кадр - (геометрия текущей порции, номер отсчета в ней)
+    history.clear()
+    current = geometry = None
+    for part, i, passed in clock.frames(mechanism.stream(DT, CHUNK, **DESIGN)):
+        if part is not current:
+            current = part
+            geometry = mechanism.frame_geometry(part['Xa'], part['Ya'], part['y_r'],
+                                                Xb, Yb, XO, YO, RB, RS, Xc, Yc, Xp, Yp)
+        history.extend([part[name][passed] for name in HISTORY_FIELDS])
+        yield geometry, i
+
+
+# 7. Функция обновления кадров анимации
+def run(frame):
+    geometry, i = frame
+    # Обновляем механизм
+    m.set_data(geometry['circle'][0][i], geometry['circle'][1][i])
+    AB.set_data(geometry['AB'][0][i], geometry['AB'][1][i])
+    L.set_data(geometry['L'][0][i], geometry['L'][1][i])
+    Pruzh.set_data(geometry['spring'][0][i], geometry['spring'][1][i])
+
+    # Обновляем графики
+    T, vx, vy, ax, ay = history.view()
+    T = T - T[-1]
+    vx_line.set_data(T, vx)
+    vy_line.set_data(T, vy)
+    ax_line.set_data(T, ax)
+    ay_line.set_data(T, ay)
+
+    return [m, AB, L, Pruzh, vx_line, vy_line, ax_line, ay_line]
+
+
+# 8. Создаем анимацию и показываем результат
+fgr.canvas.mpl_connect('close_event', lambda event: print(clock.report()))
+anim = FuncAnimation(fgr, run, frames=frames, interval=1, blit=True, cache_frame_data=False)
+
+plot.tight_layout()
+plot.show()
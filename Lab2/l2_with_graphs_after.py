@@ -1,9 +1,18 @@
 # 0. Импортируем необходимые библиотеки
 import math
+import os
+import sys
 import numpy as np  # numpy для математических вычислений
 import matplotlib.pyplot as plot  # для создания графиков
 from matplotlib.animation import FuncAnimation  # для анимации
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import cli, export, playback
+
+import mechanism
+
+ARGS = cli.parse_args()  # до создания фигур: при экспорте включается Agg
+
 # 1. Создаем фигуру и оси для графика
 fgr_gr = plot.figure(figsize=(9, 7))
 gs = fgr_gr.add_gridspec(4, 1)
@@ -64,6 +73,13 @@ Yp = np.linspace(0, 1, 2 * NP + 1)  # y-координаты точек пруж
 Xp = 0.15 * np.sin(np.pi / 2 * np.arange(2 * NP + 1))  # x-координаты точек пружины
 Pruzh = gr.plot(XO + RB + Xp, (YO + y_r[0]) * Yp)[0]  # рисуем пружину
 
+# Координаты движущихся частей для всех кадров: функция кадра только выбирает строку
+GEOMETRY = mechanism.frame_geometry(Xa, Ya, y_r, Xb, Yb, XO, YO, RB, RS, Xc, Yc, Xp, Yp)
+m_X, m_Y = GEOMETRY['circle']
+AB_X, AB_Y = GEOMETRY['AB']
+L_X, L_Y = GEOMETRY['L']
+Pruzh_X, Pruzh_Y = GEOMETRY['spring']
+
 
 # 8. Создаем графики
 vx_plot = fgr_gr.add_subplot(gs[0, 0])  # скорость по x
@@ -71,14 +87,11 @@ vy_plot = fgr_gr.add_subplot(gs[1, 0])  # скорость по y
 ax_plot = fgr_gr.add_subplot(gs[2, 0])  # ускорение по x
 ay_plot = fgr_gr.add_subplot(gs[3, 0])  # ускорение по y
 
-# Добавляем расчет скоростей и ускорений
-dt = (END_VALUE - START_VALUE) / STEPS
-# Скорости (используем центральные разности)
-vx = np.gradient(Xa, dt)
-vy = np.gradient(Ya, dt)
-# Ускорения
-ax = np.gradient(vx, dt)
-ay = np.gradient(vy, dt)
+# Добавляем расчет скоростей и ускорений: точные производные законов движения точки A
+# вычисляются вместе с координатами за один проход (без разностей по сетке t)
+A = mechanism.point_A(t, SA, Y0, RB, XO, YO)
+vx, vy = A['vx'][0], A['vy'][0]  # скорости
+ax, ay = A['ax'][0], A['ay'][0]  # ускорения
 
 # Создаем временную ось для графиков
 time_array = np.linspace(0, END_VALUE, STEPS)
@@ -117,19 +130,27 @@ ay_line.set_data(time_array[:], ay[:])
 # 9. Функция обновления кадров анимации
 def run(i):
     # Обновляем механизм
-    m.set_data([Xa[i] + RS * Xc], [Ya[i] + RS * Yc])
-    AB.set_data([Xa[i], Xb], [Ya[i], Yb])
-    L.set_data([XO + RB, XO + RB], [YO, YO + y_r[i]])
-    Pruzh.set_data(XO + RB + Xp, (YO + y_r[i]) * Yp)
+    m.set_data(m_X[i], m_Y[i])
+    AB.set_data(AB_X[i], AB_Y[i])
+    L.set_data(L_X[i], L_Y[i])
+    Pruzh.set_data(Pruzh_X[i], Pruzh_Y[i])
 
     # Обновляем графики
 
-    return [m, AB, Block, Pruzh]
+    # Возвращаем только движущиеся элементы: блок и опоры остаются в кэшированном фоне
+    return [m, AB, L, Pruzh]
 
 
 # 10. Создаем анимацию
-anim = FuncAnimation(fgr, run, frames=STEPS, interval=1)  # interval=1 задает скорость анимации
+# Кадр выбирается по настенному времени: скорость не зависит от STEPS и скорости отрисовки
+clock = playback.PlaybackClock(t, ARGS.speed)
+fgr.canvas.mpl_connect('close_event', lambda event: print(clock.report()))
+anim = FuncAnimation(fgr, run, frames=clock.frames, interval=1, blit=True, cache_frame_data=False)  # interval=1 - частота опроса часов
 
 # Показываем результат
 plot.tight_layout()
-plot.show()
+if ARGS.export:  # сохранение кадров без дисплея
+    export.export_animation(fgr, run, STEPS, ARGS.export, ARGS.workers, ARGS.dpi, ARGS.fps,
+                            static=[fgr_gr])  # графики не меняются - сохраняются один раз
+else:
+    plot.show()
@@ -0,0 +1,104 @@
+# Механизм «блок - стержень - пружина»: геометрия движущихся частей и кинематика точки A
+import numpy as np
+
+from common.grid import cartesian
+from derivatives import Jet, cos, sin
+
+# Параметры конструкции (как в l2.py): начальное отклонение, длина, радиус и центр блока
+DEFAULTS = {'SA': np.pi / 18, 'Y0': 2.3, 'RB': 0.5, 'XO': 3, 'YO': 4}
+DESIGN = ('SA', 'Y0', 'RB', 'XO', 'YO')
+COLUMNS = ('Xa', 'Ya', 'vx', 'vy', 'ax', 'ay')
+
+# Число отсчетов в одной порции потокового режима
+CHUNK = 256
+
+
+# 1. Координаты точек движущихся частей для всех кадров сразу
+def frame_geometry(Xa, Ya, y_r, Xb, Yb, XO, YO, RB, RS, Xc, Yc, Xp, Yp) -> dict:
+    # Возвращает {имя: (X, Y)} с непрерывными массивами формы (STEPS, n_points):
+    # 'circle' - малый круг в точке A, 'AB' - стержень AB, 'L' - вертикальный стержень,
+    # 'spring' - пружина. Строка i - готовые данные кадра i, поэтому функция кадра
+    # только передает представления строк без вычислений и выделения памяти
+    Xa, Ya, y_r = (np.asarray(v, dtype=float) for v in (Xa, Ya, y_r))
+    steps = len(Xa)
+
+    def buffers(n):
+        return np.empty((steps, n)), np.empty((steps, n))
+
+    circle = buffers(len(Xc))
+    np.add(Xa[:, None], RS * np.asarray(Xc), out=circle[0])
+    np.add(Ya[:, None], RS * np.asarray(Yc), out=circle[1])
+
+    AB = buffers(2)
+    AB[0][:, 0], AB[0][:, 1] = Xa, Xb
+    AB[1][:, 0], AB[1][:, 1] = Ya, Yb
+
+    L = buffers(2)
+    L[0][:] = XO + RB
+    L[1][:, 0], L[1][:, 1] = YO, YO + y_r
+
+    spring = buffers(len(Yp))
+    spring[0][:] = XO + RB + np.asarray(Xp)
+    np.multiply((YO + y_r)[:, None], np.asarray(Yp), out=spring[1])
+    return {'circle': circle, 'AB': AB, 'L': L, 'spring': spring}
+
+
+# 2. Траектория, скорость и ускорение точки A сразу для многих вариантов конструкции
+def make_grid(**axes) -> dict:
+    # make_grid(SA=np.linspace(0.1, 0.5, 20), Y0=[2, 2.3]) - декартово произведение осей,
+    # остальные параметры берутся из DEFAULTS
+    return cartesian(DEFAULTS, **axes)
+
+
+def point_A(t, SA, Y0, RB, XO, YO) -> dict:
+    # Параметры - числа или одномерные массивы длины n_designs; величины COLUMNS
+    # имеют форму (n_designs, n_samples). Законы движения записаны как в l2.py,
+    # а скорости и ускорения получаются вместе с координатами (прямое автоматическое
+    # дифференцирование) - без разностей по сетке и без ее шага
+    SA, Y0, RB, XO, YO = (np.asarray(p, dtype=float).reshape(-1, 1) for p in (SA, Y0, RB, XO, YO))
+    T = Jet.variable(np.asarray(t, dtype=float)[None, :])
+
+    y_l = sin(T) + Y0  # длина левой части
+    phi = SA * sin(2 * T)  # угол поворота
+    Xa = XO - RB + y_l * sin(phi)
+    Ya = YO - y_l * cos(phi)
+    return {'Xa': Xa.v, 'Ya': Ya.v, 'vx': Xa.d1, 'vy': Ya.d1, 'ax': Xa.d2, 'ay': Ya.d2}
+
+
+def sweep(t, grid: dict):
+    # Возвращает (величины point_A, сводка): в сводке для каждого варианта наибольшие
+    # скорость и ускорение точки A и моменты, когда они достигаются
+    values = point_A(t, *(grid[k] for k in DESIGN))
+    t = np.asarray(t, dtype=float)
+    speed = np.hypot(values['vx'], values['vy'])
+    acceleration = np.hypot(values['ax'], values['ay'])
+    i_v, i_a = speed.argmax(axis=1), acceleration.argmax(axis=1)
+    rows = np.arange(len(speed))
+    stats = {
+        'max_speed': speed[rows, i_v], 't_max_speed': t[i_v],
+        'max_acceleration': acceleration[rows, i_a], 't_max_acceleration': t[i_a],
+    }
+    return values, stats
+
+
+# 3. Потоковый режим: порции отсчетов по требованию, без заранее заданного конца
+def stream(dt: float, chunk: int = CHUNK, t0: float = 0.0, t1: float = None, **design):
+    # Генератор порций {'t', 'y_r', <COLUMNS>} по chunk отсчетов с шагом dt для одной
+    # конструкции (параметры - как в DEFAULTS). Без t1 продолжается бесконечно;
+    # моменты считаются от номера отсчета, поэтому ошибка шага не накапливается
+    unknown = set(design) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f'unknown design parameters: {sorted(unknown)}')
+    p = {**DEFAULTS, **design}
+    k = 0
+    while True:
+        t = t0 + dt * np.arange(k, k + chunk)
+        if t1 is not None:
+            t = t[t <= t1]
+            if not len(t):
+                return
+        part = {name: v[0] for name, v in point_A(t, *(p[n] for n in DESIGN)).items()}
+        part['t'] = t
+        part['y_r'] = np.sin(t) - p['Y0']  # правая часть механизма
+        yield part
+        k += chunk
@@ -0,0 +1,71 @@
+# Кэш результатов моделирования на диске с адресацией по содержимому
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from common import diskcache
+from dense import DenseSolution
+from dynamics import RHS_VERSION
+
+CACHE_DIR = os.environ.get('SIMULATION_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'okmds', 'simulations'))
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+COLUMNS = ('x', 'phi', 'dx', 'dphi', 'N_eps', 'N_nu')
+
+
+class SimulationCache:
+    # Результат - массив (len(COLUMNS), len(t)) в формате .npy; ключ - хэш параметров,
+    # начальных условий, сетки времени, настроек решателя и версии уравнений.
+    # При превышении max_bytes удаляются записи, которые дольше всего не читались
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, params, y0, t, solver: dict) -> str:
+        h = hashlib.sha256()
+        h.update(json.dumps([RHS_VERSION, [float(p) for p in params], [float(v) for v in y0], solver],
+                            sort_keys=True).encode())
+        h.update(np.ascontiguousarray(t, dtype='<f8').tobytes())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.npy')
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            result = np.load(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        diskcache.touch(path)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: np.ndarray):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        diskcache.atomic_write(self._path(key), lambda f: np.save(f, result))
+        diskcache.evict(self.cache_dir, '.npy', self.max_bytes)
+
+    def solve(self, M, m, l, r, c, g, y0, t, method: str = 'DOP853',
+              rtol: float = 1e-8, atol: float = 1e-10) -> np.ndarray:
+        # Строки результата - COLUMNS на узлах сетки t; решение - только при промахе
+        params = (M, m, l, r, c, g)
+        t = np.asarray(t, dtype=float)
+        key = self.key(params, y0, t, {'method': method, 'rtol': rtol, 'atol': atol})
+        result = self.get(key)
+        if result is None:
+            solution = DenseSolution(*params, y0, t[0], t[-1], method=method, rtol=rtol, atol=atol)
+            result = np.vstack([solution.states(t), solution.reactions(t)])
+            self.put(key, result)
+        return result
+
+    def stats(self) -> dict:
+        entries = diskcache.entries(self.cache_dir, '.npy') if os.path.isdir(self.cache_dir) else []
+        size = sum(size for _, size, _ in entries)
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(entries), 'bytes': size}
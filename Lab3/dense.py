@@ -0,0 +1,36 @@
+# Непрерывное (плотное) решение: состояния и реакции в любые моменты из одного решения
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from dynamics import MotionEquations, ivp_functions, reactions
+
+
+class DenseSolution:
+    # Шаги решателя определяются только точностью (rtol, atol); кадры анимации, графики
+    # и реакции N_eps, N_nu вычисляются интерполянтом решателя на любой сетке времени
+    def __init__(self, M, m, l, r, c, g, y0, t0: float, t1: float,
+                 method: str = 'DOP853', rtol: float = 1e-8, atol: float = 1e-10):
+        self.params = (M, m, l, r, c, g)
+        self.rhs = MotionEquations(*self.params)
+        result = solve_ivp(t_span=(t0, t1), y0=y0, method=method, dense_output=True,
+                           rtol=rtol, atol=atol, **ivp_functions(self.rhs, method))
+        if not result.success:
+            raise RuntimeError(result.message)
+        self.t0, self.t1 = t0, t1
+        self.nsteps = len(result.t) - 1  # число шагов решателя
+        self.nfev = result.nfev
+        self.njev = result.njev
+        self._sol = result.sol
+
+    def states(self, t) -> np.ndarray:
+        # Состояния [x, phi, x', phi'] формы (4,) + np.shape(t)
+        return self._sol(t)
+
+    def accelerations(self, t) -> np.ndarray:
+        # Производные состояний [x', phi', x'', phi''] той же формы
+        return self.rhs(self.states(t)) if np.ndim(t) else self.rhs(self.states(t)).copy()
+
+    def reactions(self, t):
+        # Силы реакции N_eps, N_nu в моменты t
+        S = self.states(t)
+        return reactions(S, self.rhs(S), *self.params)
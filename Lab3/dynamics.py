@@ -0,0 +1,131 @@
+# Уравнения движения системы «блок - груз на нити - пружина»
+# Вектор состояния y = [x, phi, x', phi'], производная dy = [x', phi', x'', phi'']
+import time
+
+import numpy as np
+from scipy.integrate import odeint
+
+# Версия уравнений движения и формул реакций: входит в ключ кэша результатов,
+# увеличивается при любом изменении MotionEquations или reactions
+RHS_VERSION = 1
+
+
+# 1. Исходная правая часть (эталон для сравнения)
+def EqOfMovement(y, t, M, m, l, r, c, g):
+    dy = np.zeros_like(y)
+    dy[0] = y[2]  # dx/dt = v
+    dy[1] = y[3]  # dφ/dt = ω
+
+    delta = (m * g) / c
+
+    # Коэффициенты системы уравнений
+    a11 = ((M / 2) + m)
+    a12 = 0
+    b1 = m * g * np.cos(y[1]) - c * (y[0] + delta) + m * l * y[3] * y[3]
+
+    a21 = 0
+    a22 = l
+    b2 = -g * np.sin(y[1]) - y[3] * (2 * y[2] - r * y[3])
+
+    # Решение системы уравнений
+    dy[2] = (b1 * a22 - b2 * a12)/(a11 * a22 - a21 * a12)  # ускорение по x
+    dy[3] = (a11 * b2 - a21 * b1)/(a11 * a22 - a21 * a12)  # угловое ускорение
+
+    return dy
+
+
+# 2. Правая часть с предвычисленными постоянными и аналитической матрицей Якоби
+class MotionEquations:
+    # Матрица системы диагональна (a12 = a21 = 0), поэтому правило Крамера сводится
+    # к делению на a11 и l; все зависящие только от параметров множители считаются
+    # один раз. Параметры могут быть массивами - тогда y имеет форму (4, N).
+    # Для одного состояния (форма (4,)) результат пишется в один и тот же буфер
+    def __init__(self, M, m, l, r, c, g):
+        self.params = (M, m, l, r, c, g)
+        a11 = M / 2 + m
+        self.delta = m * g / c
+        self.k_cos = m * g / a11  # x'' = k_cos cos(phi) - k_x (x + delta) + k_w phi'^2
+        self.k_x = c / a11
+        self.k_w = m * l / a11
+        self.k_sin = g / l  # phi'' = -k_sin sin(phi) - k_c phi' x' + k_r phi'^2
+        self.k_c = 2 / l
+        self.k_r = r / l
+
+        self._dy = np.empty(4)
+        self._jac = np.zeros((4, 4))
+        self._jac[0, 2] = 1
+        self._jac[1, 3] = 1
+        self.nfev = 0  # число вычислений правой части
+        self.njev = 0  # число вычислений матрицы Якоби
+
+    def __call__(self, y, t=None):
+        self.nfev += 1
+        y = np.asarray(y)
+        dy = self._dy if y.shape == (4,) else np.empty(y.shape)
+        x, phi, dx, dphi = y
+        dy[0] = dx
+        dy[1] = dphi
+        dy[2] = self.k_cos * np.cos(phi) - self.k_x * (x + self.delta) + self.k_w * dphi * dphi
+        dy[3] = dphi * (self.k_r * dphi - self.k_c * dx) - self.k_sin * np.sin(phi)
+        return dy
+
+    def jac(self, y, t=None):
+        # J[i, j] = d(dy[i]) / d(y[j]) для одного состояния (Dfun для odeint)
+        self.njev += 1
+        x, phi, dx, dphi = y
+        J = self._jac
+        J[2, 0] = -self.k_x
+        J[2, 1] = -self.k_cos * np.sin(phi)
+        J[2, 3] = 2 * self.k_w * dphi
+        J[3, 1] = -self.k_sin * np.cos(phi)
+        J[3, 2] = -self.k_c * dphi
+        J[3, 3] = 2 * self.k_r * dphi - self.k_c * dx
+        return J
+
+    def reset_counters(self):
+        self.nfev = 0
+        self.njev = 0
+
+
+# 3. Силы реакции по состояниям S = [x, phi, x', phi'] и их производным dS (по первой оси)
+def reactions(S, dS, M, m, l, r, c, g):
+    x, phi, dx, dphi = S[0], S[1], S[2], S[3]
+    ddx, ddphi = dS[2], dS[3]
+
+    l_val = l + x - r * phi  # текущая длина
+    dl = dx - r * dphi  # производная длины
+    tangential = m * (l_val * ddphi + r * dphi * dphi + 2 * dl * dphi)
+    radial = m * (ddx - l_val * dphi * dphi)
+
+    N_eps = -tangential * np.cos(phi) - radial * np.sin(phi)
+    N_nu = -tangential * np.sin(phi) + radial * np.cos(phi) - c * x - (M + m) * g
+    return N_eps, N_nu
+
+
+# 4. Аргументы solve_ivp для правой части
+def ivp_functions(rhs: MotionEquations, method: str) -> dict:
+    # Решатели solve_ivp хранят производные между вызовами, поэтому общий буфер
+    # копируется; матрица Якоби передается только неявным методам
+    functions = {'fun': lambda t, y: rhs(y).copy()}
+    if method in ('Radau', 'BDF', 'LSODA'):
+        functions['jac'] = lambda t, y: rhs.jac(y).copy()
+    return functions
+
+
+# 5. Сравнение с исходной правой частью: число вычислений и время решения
+def benchmark(y0, t, M, m, l, r, c, g, repeat: int = 5) -> dict:
+    params = (M, m, l, r, c, g)
+    rhs = MotionEquations(*params)
+    result = {}
+    for name, run in (
+        ('reference', lambda: odeint(EqOfMovement, y0, t, params, full_output=True)),
+        ('optimized', lambda: odeint(rhs, y0, t, Dfun=rhs.jac, full_output=True)),
+    ):
+        best = np.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            Y, info = run()
+            best = min(best, time.perf_counter() - start)
+        result[name] = {'nfev': int(info['nfe'][-1]), 'njev': int(info['nje'][-1]), 'time': best, 'Y': Y}
+    result['max_diff'] = float(np.max(np.abs(result['reference']['Y'] - result['optimized']['Y'])))
+    return result
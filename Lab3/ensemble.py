@@ -0,0 +1,116 @@
+# Интегрирование ансамбля начальных условий одним векторизованным проходом
+import numpy as np
+
+from dynamics import MotionEquations
+
+
+# 1. Коэффициенты вложенной схемы Дормана - Принса 5(4)
+DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+# Разность весов решений 5-го и 4-го порядка - оценка локальной погрешности
+DP_E = (71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+# Наименьший шаг dopri5 (доля длины интервала) и предельное число попыток шага
+MIN_STEP = 1e-12
+MAX_STEPS = 100_000
+
+
+# 2. Шаги схем для состояния формы (4, N); система автономна, время не передается
+def _rk4_step(rhs, S, h):
+    k1 = rhs(S)
+    k2 = rhs(S + h / 2 * k1)
+    k3 = rhs(S + h / 2 * k2)
+    k4 = rhs(S + h * k3)
+    return S + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def _dopri_step(rhs, S, h, k1):
+    # Возвращает новое состояние, оценку погрешности и производную в конце шага (FSAL)
+    k = [k1]
+    for row in DP_A[1:]:
+        k.append(rhs(S + h * sum(a * ki for a, ki in zip(row, k) if a)))
+    S_new = S + h * sum(b * ki for b, ki in zip(DP_A[-1], k) if b)
+    k.append(rhs(S_new))
+    err = h * sum(e * ki for e, ki in zip(DP_E, k) if e)
+    return S_new, err, k[-1]
+
+
+# 3. Интегрирование ансамбля
+def integrate_ensemble(Y0, t, M, m, l, r, c, g, method: str = 'dopri5',
+                       rtol: float = 1e-6, atol: float = 1e-9, substeps: int = 4,
+                       max_steps: int = MAX_STEPS):
+    # Y0 - начальные состояния формы (N, 4) или одно состояние (4,); параметры - числа
+    # или массивы длины N (свои для каждого члена ансамбля). Возвращает массив
+    # (len(t), N, 4), для одного состояния - (len(t), 4).
+    # Состояние всегда хранится как (4, N): для формы (4,) MotionEquations пишет результат
+    # в общий буфер, и стадии схемы затирали бы друг друга
+    # 'rk4' - классическая схема с substeps равными шагами на каждом интервале сетки t;
+    # 'dopri5' - общий для всего ансамбля адаптивный шаг по худшему члену ансамбля.
+    # Член ансамбля, решение которого не число (c = 0, l = 0, переполнение, не исчезающее
+    # и при шаге MIN_STEP), дальше равен nan и в выборе шага не участвует. Если шаг
+    # уменьшился до MIN_STEP при конечной ошибке или попыток больше max_steps - RuntimeError
+    rhs = MotionEquations(*(np.asarray(p, dtype=float) for p in (M, m, l, r, c, g)))
+    t = np.asarray(t, dtype=float)
+    Y0 = np.asarray(Y0, dtype=float)
+    if Y0.ndim not in (1, 2) or Y0.shape[-1] != 4:
+        raise ValueError(f'Y0 must have shape (N, 4) or (4,), got {Y0.shape}')
+    S = np.atleast_2d(Y0).T.copy()
+    out = np.empty((len(t),) + S.T.shape)
+    out[0] = S.T
+
+    if method == 'rk4':
+        for i in range(1, len(t)):
+            h = (t[i] - t[i - 1]) / substeps
+            for _ in range(substeps):
+                S = _rk4_step(rhs, S, h)
+            out[i] = S.T
+        return out.reshape((len(t),) + Y0.shape)
+
+    if method != 'dopri5':
+        raise ValueError(f'unknown method: {method}')
+
+    k1 = rhs(S).copy()
+    alive = np.isfinite(S).all(axis=0) & np.isfinite(k1).all(axis=0)
+    S[:, ~alive] = np.nan
+    span = t[-1] - t[0] if len(t) > 1 else 0.0
+    h = span / max(len(t) - 1, 1)
+    h_min = MIN_STEP * span
+    tc = t[0]
+    attempts = 0
+    for i in range(1, len(t)):
+        while tc < t[i]:
+            attempts += 1
+            if attempts > max_steps:
+                raise RuntimeError(f'dopri5: more than {max_steps} steps, stopped at t = {tc:g}')
+            # Шаг укорачивается, чтобы точно попасть в узел выходной сетки
+            last = h >= t[i] - tc
+            step = t[i] - tc if last else h
+            S_new, err, k_new = _dopri_step(rhs, S, step, k1)
+            scale = atol + rtol * np.maximum(np.abs(S), np.abs(S_new))
+            member = np.sqrt(np.mean((err / scale) ** 2, axis=0))
+            member = np.where(np.isfinite(member) & np.isfinite(S_new).all(axis=0), member, np.inf)
+            if step <= h_min:
+                # Меньше шаг не станет: члены, которые и при нем не числа, выбывают
+                lost = alive & np.isinf(member)
+                alive &= ~lost
+                S_new[:, lost] = np.nan
+            norm = member[alive].max() if alive.any() else 0.0
+            factor = min(5.0, max(0.2, 0.9 * norm ** -0.2 if norm > 0 else 5.0))
+            if norm <= 1:
+                tc = t[i] if last else tc + step
+                S, k1 = S_new, k_new
+                # Укороченный до узла шаг не уменьшает следующий
+                h = max(h, step * factor) if last else step * factor
+            elif step <= h_min:
+                raise RuntimeError(f'dopri5: step size below {h_min:g} at t = {tc:g}')
+            else:
+                h = max(step * factor, h_min)
+        out[i] = S.T
+    return out.reshape((len(t),) + Y0.shape)
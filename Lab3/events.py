@@ -0,0 +1,60 @@
+# Поиск событий во время интегрирования: потеря контакта и экстремумы угла
+from scipy.integrate import solve_ivp
+
+from dynamics import MotionEquations, ivp_functions, reactions
+
+
+# 1. Функции событий g(S, dS, params): событие - смена знака g.
+# 'N_nu', 'N_eps' - смена знака реакции (груз теряет контакт),
+# 'phi' - прохождение нижнего положения, 'dphi' - экстремум угла
+# (направление -1 - максимум phi, +1 - минимум)
+EVENTS = {
+    'N_nu': lambda S, dS, params: reactions(S, dS, *params)[1],
+    'N_eps': lambda S, dS, params: reactions(S, dS, *params)[0],
+    'phi': lambda S, dS, params: S[1],
+    'dphi': lambda S, dS, params: S[3],
+}
+
+
+def find_events(M, m, l, r, c, g, y0, t0: float, t1: float, events=tuple(EVENTS),
+                terminal=(), direction=None, method: str = 'DOP853',
+                rtol: float = 1e-8, atol: float = 1e-10) -> dict:
+    # Точные моменты событий находятся по локальному интерполянту решателя на шаге,
+    # где функция сменила знак; история решения не сохраняется (хранится только
+    # конечное состояние). terminal - имена событий, останавливающих расчет (отсутствующие
+    # в events добавляются к ним);
+    # direction - словарь {имя: -1 | 0 | 1} для учета только убывания/возрастания.
+    # Возвращает {'events': {имя: (моменты (k,), состояния (k, 4))},
+    #             't_final', 'y_final', 'stopped' (имя события или None), 'nfev'}
+    params = (M, m, l, r, c, g)
+    rhs = MotionEquations(*params)
+    direction = direction or {}
+    events = list(events)
+    events += [name for name in terminal if name not in events]
+    unknown = (set(events) | set(terminal) | set(direction)) - set(EVENTS)
+    if unknown:
+        raise ValueError(f'unknown events: {sorted(unknown)}')
+
+    functions = []
+    for name in events:
+        def event(t, y, g_=EVENTS[name]):
+            return float(g_(y, rhs(y), params))
+        event.terminal = name in terminal
+        event.direction = direction.get(name, 0)
+        functions.append(event)
+
+    result = solve_ivp(t_span=(t0, t1), y0=y0, method=method, t_eval=[t1], events=functions,
+                       rtol=rtol, atol=atol, **ivp_functions(rhs, method))
+    if result.status == -1:
+        raise RuntimeError(result.message)
+
+    found = {name: (result.t_events[k], result.y_events[k].reshape(-1, 4)) for k, name in enumerate(events)}
+    stopped = None
+    if result.status == 1:
+        # Расчет остановлен событием: конечное состояние - состояние в момент события
+        t_final = min(found[name][0][-1] for name in terminal if len(found[name][0]))
+        stopped = next(name for name in terminal if len(found[name][0]) and found[name][0][-1] == t_final)
+        y_final = found[stopped][1][-1]
+    else:
+        t_final, y_final = t1, result.y[:, -1]
+    return {'events': found, 't_final': t_final, 'y_final': y_final, 'stopped': stopped, 'nfev': result.nfev}
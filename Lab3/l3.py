@@ -1,32 +1,16 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.pyplot as plot
 from matplotlib.animation import FuncAnimation
-from scipy.integrate import odeint
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import cli, export, playback
 
-def EqOfMovement(y, t, M, m, l, r, c, g):
-    # y[0,1,2,3] = x,phi,x',phi'
-    # dy[0,1,2,3] = x',phi',x'',phi''
-    dy = np.zeros_like(y)
-    dy[0] = y[2] #тривиальные уравнения вида
-    dy[1] = y[3] #dx = x’, dphi = phi’
+import cache
 
-    delta = (m * g) / c
-
-    a11 = ((M / 2) + m)   # коэффициенты первого уравнения
-    a12 = 0
-    b1 = m * g * np.cos(y[1]) - c * (y[0] + delta) + m * l * y[3] * y[3]
-
-    a21 = 0  # коэффициенты
-    a22 = l          # второго уравнения
-    b2 = -g * np.sin(y[1]) - y[3] * (2 * y[2] - r * y[3])
-
-    # решение правилом Крамера
-    dy[2] = (b1 * a22 - b2 * a12)/(a11 * a22 - a21 * a12)
-    dy[3] = (a11 * b2 - a21 * b1)/(a11 * a22 - a21 * a12)
-
-    return dy
+ARGS = cli.parse_args()  # до создания фигур: при экспорте включается Agg
 
 
 STEPS = 1500
@@ -45,24 +29,10 @@ dx0 = 0
 dphi0 = 0
 y0 = [x0, phi0, dx0, dphi0]
 
-t = np.linspace(START_VALUE, END_VALUE, STEPS) # Сетка по времени
-
-Y = odeint(EqOfMovement, y0, t, (M,m,l,r,c,g))
-y = Y[:, 0]
-phi = Y[:, 1]
-dx = Y[:, 2]
-dphi = Y[:, 3]
-
-
-dY = EqOfMovement(Y, t, M, m, l, r, c, g)
-ddx = dY[:, 2]
-ddphi = dY[:, 3]
-
-l = l + y - r * phi
-dl = dx - r * dphi
-
-N_eps = -m * (l * ddphi + r * dphi * dphi + 2 * dl * dphi) * np.cos(phi) - m * (ddx - l * dphi * dphi) * np.sin(phi)
-N_nu = -m * (l * ddphi + r * dphi * dphi + 2 * dl * dphi) * np.sin(phi) + m * (ddx - l * dphi * dphi) * np.cos(phi) - c * y - (M + m) * g
+# Решение берется из кэша, если такой же расчет уже выполнялся; при промахе
+# система решается один раз с непрерывным выходом, который вычисляется на сетке кадров
+t = np.linspace(START_VALUE, END_VALUE, STEPS) # Сетка кадров по времени
+y, phi, dx, dphi, N_eps, N_nu = cache.SimulationCache().solve(M, m, l, r, c, g, y0, t)
 
 fgr = plot.figure()
 gr = fgr.add_subplot(1, 1, 1)
@@ -121,10 +91,17 @@ def run(i):
     L.set_data([XO + RB, XO + RB], [YO, YO + y_r[i]])  # движение вертикального стержня
     Pruzh.set_data(XO + RB + Xp, (YO + y_r[i]) * Yp)  # движение пружины
 
-    return [m, AB, Block, Pruzh]
+    # Возвращаем только движущиеся элементы: блок и опоры остаются в кэшированном фоне
+    return [m, AB, L, Pruzh]
 
 # 9. Создаем анимацию
-anim = FuncAnimation(fgr, run, frames=STEPS, interval=1)  # interval=1 задает скорость анимации
+# Кадр выбирается по настенному времени: скорость не зависит от STEPS и скорости отрисовки
+clock = playback.PlaybackClock(t, ARGS.speed)
+fgr.canvas.mpl_connect('close_event', lambda event: print(clock.report()))
+anim = FuncAnimation(fgr, run, frames=clock.frames, interval=1, blit=True, cache_frame_data=False)  # interval=1 - частота опроса часов
 
 # Показываем результат
-plot.show()
\ No newline at end of file
+if ARGS.export:  # сохранение кадров без дисплея
+    export.export_animation(fgr, run, STEPS, ARGS.export, ARGS.workers, ARGS.dpi, ARGS.fps)
+else:
+    plot.show()
@@ -1,32 +1,16 @@
 # 0. Импортируем необходимые библиотеки
+import os
+import sys
 import numpy as np  # numpy для математических вычислений
 import matplotlib.pyplot as plot  # для создания графиков
 from matplotlib.animation import FuncAnimation  # для анимации
-from scipy.integrate import odeint  # для решения дифференциальных уравнений
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import cli, export, playback
 
-# 1. Определяем функцию для системы дифференциальных уравнений движения
-def EqOfMovement(y, t, M, m, l, r, c, g):
-    dy = np.zeros_like(y)
-    dy[0] = y[2]  # dx/dt = v
-    dy[1] = y[3]  # dφ/dt = ω
+import cache
 
-    delta = (m * g) / c
-
-    # Коэффициенты системы уравнений
-    a11 = ((M / 2) + m)
-    a12 = 0
-    b1 = m * g * np.cos(y[1]) - c * (y[0] + delta) + m * l * y[3] * y[3]
-
-    a21 = 0
-    a22 = l
-    b2 = -g * np.sin(y[1]) - y[3] * (2 * y[2] - r * y[3])
-
-    # Решение системы уравнений
-    dy[2] = (b1 * a22 - b2 * a12)/(a11 * a22 - a21 * a12)  # ускорение по x
-    dy[3] = (a11 * b2 - a21 * b1)/(a11 * a22 - a21 * a12)  # угловое ускорение
-
-    return dy
+ARGS = cli.parse_args()  # до создания фигур: при экспорте включается Agg
 
 
 # 2. Задаем основные параметры системы
@@ -48,26 +32,10 @@ dphi0 = 0  # начальная угловая скорость
 y0 = [x0, phi0, dx0, dphi0]  # вектор начальных условий
 
 # 4. Создаем временной массив и решаем систему уравнений
-t = np.linspace(START_VALUE, END_VALUE, STEPS)  # временной массив
-Y = odeint(EqOfMovement, y0, t, (M,m,l,r,c,g))  # решение системы
-y = Y[:, 0]
-phi = Y[:, 1]
-dx = Y[:, 2]
-dphi = Y[:, 3]
-
-# 5. Вычисляем производные и силы реакции
-dY = EqOfMovement(Y, t, M, m, l, r, c, g)
-ddx = dY[:, 2]  # ускорение по x
-ddphi = dY[:, 3]  # угловое ускорение
-
-l_val = l + y - r * phi  # текущая длина
-dl = dx - r * dphi  # производная длины
-
-# Вычисление сил реакции
-N_eps = -m * (l_val * ddphi + r * dphi * dphi + 2 * dl * dphi) * np.cos(phi) - \
-        m * (ddx - l_val * dphi * dphi) * np.sin(phi)
-N_nu = -m * (l_val * ddphi + r * dphi * dphi + 2 * dl * dphi) * np.sin(phi) + \
-       m * (ddx - l_val * dphi * dphi) * np.cos(phi) - c * y - (M + m) * g
+# Решение берется из кэша, если такой же расчет уже выполнялся; при промахе
+# система решается один раз с непрерывным выходом, который вычисляется на сетке кадров
+t = np.linspace(START_VALUE, END_VALUE, STEPS)  # временной массив кадров
+y, phi, dx, dphi, N_eps, N_nu = cache.SimulationCache().solve(M, m, l, r, c, g, y0, t)
 
 # 6. Создаем фигуру с сеткой для графиков
 fgr_gr = plot.figure(figsize=(9, 7))
@@ -160,10 +128,18 @@ def run(i):
     L.set_data([XO + RB, XO + RB], [YO, YO + y_r[i]])
     Pruzh.set_data(XO + RB + Xp, (YO + y_r[i]) * Yp)
 
-    return [m, AB, Block, Pruzh]
+    # Возвращаем только движущиеся элементы: блок и опоры остаются в кэшированном фоне
+    return [m, AB, L, Pruzh]
 
 # 16. Создаем и показываем анимацию
-anim = FuncAnimation(fgr, run, frames=STEPS, interval=1)  # создаем анимацию
+# Кадр выбирается по настенному времени: скорость не зависит от STEPS и скорости отрисовки
+clock = playback.PlaybackClock(t, ARGS.speed)
+fgr.canvas.mpl_connect('close_event', lambda event: print(clock.report()))
+anim = FuncAnimation(fgr, run, frames=clock.frames, interval=1, blit=True, cache_frame_data=False)  # создаем анимацию
 
 # Показываем результат
-plot.show()
+if ARGS.export:  # сохранение кадров без дисплея
+    export.export_animation(fgr, run, STEPS, ARGS.export, ARGS.workers, ARGS.dpi, ARGS.fps,
+                            static=[fgr_gr])  # графики не меняются - сохраняются один раз
+else:
+    plot.show()
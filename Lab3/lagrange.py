@@ -0,0 +1,138 @@
+# Вывод уравнений движения из энергий системы и генерация numpy-кода правой части
+import numpy as np
+
+
+# 1. Модель системы «блок - груз на нити - пружина» в обобщенных координатах x, phi.
+# Выражения записываются строками; скорости обозначаются d<координата>, ускорения dd<координата>
+COORDS = ('x', 'phi')
+PARAMS = ('M', 'm', 'l', 'r', 'c', 'g')
+
+# Модель по умолчанию - та же упрощенная модель, что в EqOfMovement (LagrangeModel() -
+# ее замена, совпадающая с MotionEquations до ошибок округления), а не полный лагранжиан
+# системы: в KINETIC длина нити постоянна (l), а не l + x - r*phi.
+# Кинетическая и потенциальная энергии (пружина растянута на delta = m g / c в равновесии)
+KINETIC = '(M/2 + m) * dx**2 / 2 + m * l**2 * dphi**2 / 2'
+POTENTIAL = 'c * (x + m*g/c)**2 / 2 - m * g * l * cos(phi)'
+
+# Обобщенные силы - члены EqOfMovement, выведенные вручную и не следующие из KINETIC
+# и POTENTIAL: тяжесть груза вдоль нити (вместе с -m g l sin(phi) из POTENTIAL она не
+# имеет общего потенциала), центробежная сила и силы от сматывания нити с блока радиуса r.
+# Автоматически выводится только то, что следует из энергий; при изменении модели,
+# затрагивающем эти члены, FORCES по-прежнему исправляются вручную
+FORCES = {
+    'x': 'm * g * cos(phi) + m * l * dphi**2',
+    'phi': '-m * l * dphi * (2*dx - r*dphi)',
+}
+
+# Вспомогательные величины для сил реакции: текущая длина нити, ее производная,
+# касательная и радиальная составляющие силы инерции груза
+AUXILIARY = {
+    'length': 'l + x - r*phi',
+    'dlength': 'dx - r*dphi',
+    'tangential': 'm * (length*ddphi + r*dphi**2 + 2*dlength*dphi)',
+    'radial': 'm * (ddx - length*dphi**2)',
+}
+REACTIONS = {
+    'N_eps': '-tangential*cos(phi) - radial*sin(phi)',
+    'N_nu': '-tangential*sin(phi) + radial*cos(phi) - c*x - (M + m)*g',
+}
+
+
+# 2. Символьный вывод: уравнения Лагранжа второго рода
+def derive(kinetic: str = KINETIC, potential: str = POTENTIAL, forces: dict = FORCES,
+           coords: tuple = COORDS, params: tuple = PARAMS,
+           auxiliary: dict = AUXILIARY, reactions: dict = REACTIONS) -> dict:
+    # d/dt(dL/dq') - dL/dq = Q  =>  A(q, q') q'' = b(q, q'), где
+    # A = d2T/dq'dq' - матрица масс, b = Q + dL/dq - (d2L/dq'dq) q'.
+    # Возвращает {'state', 'rhs' (список), 'jac' (Matrix), 'reactions' (словарь)}
+    import sympy as sp
+
+    q = [sp.Symbol(name) for name in coords]
+    dq = [sp.Symbol('d' + name) for name in coords]
+    ddq = [sp.Symbol('dd' + name) for name in coords]
+    namespace = {s.name: s for s in q + dq + ddq}
+    namespace.update({name: sp.Symbol(name) for name in params})
+
+    def parse(expr: str):
+        return sp.sympify(expr, locals=namespace)
+
+    T = parse(kinetic)
+    L = T - parse(potential)
+    Q = [parse(forces.get(name, '0')) for name in coords]
+
+    n = len(coords)
+    A = sp.Matrix(n, n, lambda i, j: sp.diff(T, dq[i], dq[j]))
+    b = sp.Matrix([Q[i] + sp.diff(L, q[i]) - sum(sp.diff(L, dq[i], q[j]) * dq[j] for j in range(n))
+                   for i in range(n)])
+    acc = [sp.simplify(a) for a in A.LUsolve(b)]
+
+    rhs = dq + acc
+    state = q + dq
+    jac = sp.Matrix(rhs).jacobian(state)
+
+    # Реакции выражаются через состояние: ускорения подставляются из уравнений движения
+    for name, expr in auxiliary.items():
+        namespace[name] = parse(expr)
+    found = {name: parse(expr).subs(dict(zip(ddq, acc))) for name, expr in reactions.items()}
+    return {'state': [s.name for s in state], 'params': list(params), 'rhs': rhs, 'jac': jac, 'reactions': found}
+
+
+# 3. Генерация кода с исключением общих подвыражений
+def generate_source(derived: dict) -> str:
+    # Три функции f(y, <параметры>, out) - правая часть, матрица Якоби и реакции;
+    # каждая записывает все величины в out за один проход
+    import sympy as sp
+    from sympy.printing.numpy import NumPyPrinter
+
+    printer = NumPyPrinter()
+    header = ', '.join(['y'] + derived['params'] + ['out'])
+    unpack = f"    {', '.join(derived['state'])}, = y"
+    n = len(derived['state'])
+    blocks = {
+        'rhs': [([k], e) for k, e in enumerate(derived['rhs'])],
+        'jac': [([i, j], derived['jac'][i, j]) for i in range(n) for j in range(n)],
+        'reactions': [([k], e) for k, e in enumerate(derived['reactions'].values())],
+    }
+
+    source = []
+    for name, entries in blocks.items():
+        replacements, reduced = sp.cse([e for _, e in entries], symbols=sp.numbered_symbols('_s'))
+        lines = [f'def {name}({header}):', unpack]
+        for symbol, value in replacements:
+            lines.append(f'    {symbol} = {printer.doprint(value)}')
+        for (index, _), value in zip(entries, reduced):
+            lines.append(f"    out[{', '.join(map(str, index))}, ...] = {printer.doprint(value)}")
+        source.append('\n'.join(lines) + '\n')
+    return '\n\n'.join(source)
+
+
+# 4. Скомпилированная модель - замена EqOfMovement и reactions
+class LagrangeModel:
+    # rhs(y, t, M, m, l, r, c, g) и jac(y, t, ...) вызываются так же, как EqOfMovement
+    # (jac подходит как Dfun для odeint). Состояние y - форма (4,) или (4, N),
+    # параметры - числа или массивы, совместимые по форме с y[0]
+    def __init__(self, kinetic: str = KINETIC, potential: str = POTENTIAL, forces: dict = FORCES,
+                 auxiliary: dict = AUXILIARY, reactions: dict = REACTIONS):
+        derived = derive(kinetic, potential, forces, auxiliary=auxiliary, reactions=reactions)
+        self.state = derived['state']
+        self.names = tuple(derived['reactions'])
+        self.source = generate_source(derived)
+        namespace = {'numpy': np}
+        exec(self.source, namespace)
+        self._rhs, self._jac, self._reactions = namespace['rhs'], namespace['jac'], namespace['reactions']
+
+    def _call(self, f, lead: tuple, y, params):
+        y = np.asarray(y, dtype=float)
+        out = np.empty(lead + np.broadcast_shapes(y.shape[1:], *(np.shape(p) for p in params)))
+        f(y, *params, out)
+        return out
+
+    def rhs(self, y, t, M, m, l, r, c, g) -> np.ndarray:
+        return self._call(self._rhs, (len(self.state),), y, (M, m, l, r, c, g))
+
+    def jac(self, y, t, M, m, l, r, c, g) -> np.ndarray:
+        return self._call(self._jac, (len(self.state),) * 2, y, (M, m, l, r, c, g))
+
+    def reactions(self, y, t, M, m, l, r, c, g):
+        # Силы реакции в порядке REACTIONS (N_eps, N_nu) по состоянию y
+        return tuple(self._call(self._reactions, (len(self.names),), y, (M, m, l, r, c, g)))
@@ -0,0 +1,93 @@
+# Малые колебания: линеаризация около равновесия и решение в замкнутом виде по модам
+import numpy as np
+from scipy.integrate import cumulative_trapezoid
+
+from dense import DenseSolution
+from dynamics import MotionEquations
+
+# Допустимая ошибка линейного решения; если оценка, умноженная на ESTIMATE_SAFETY,
+# больше - решается нелинейная задача
+LINEAR_TOL = 1e-4
+ESTIMATE_SAFETY = 2
+
+# Число узлов на период самой быстрой моды при интегрировании невязки
+NODES_PER_PERIOD = 64
+
+
+# 1. Положение равновесия
+def equilibrium(M, m, l, r, c, g) -> np.ndarray:
+    # Пружина в равновесии уже растянута на delta = m g / c (это учтено в правой части),
+    # поэтому x'' = 0 при x = 0, phi = 0 и нулевых скоростях
+    return np.zeros(4)
+
+
+# 2. Линейное решение y(t) = y_eq + V exp(L (t - t0)) V^-1 (y0 - y_eq)
+class ModalSolution:
+    # V - моды (столбцы), L - собственные значения матрицы Якоби в равновесии.
+    # Для этой системы моды развязаны: x - пружинная, phi - маятниковая
+    def __init__(self, M, m, l, r, c, g, y0, t0: float = 0.0):
+        self.params = (M, m, l, r, c, g)
+        self.rhs = MotionEquations(*self.params)
+        self.t0 = t0
+        self.y_eq = equilibrium(*self.params)
+        self.A = self.rhs.jac(self.y_eq).copy()
+        self.eigenvalues, self.modes = np.linalg.eig(self.A)
+        self.amplitudes = np.linalg.solve(self.modes, np.asarray(y0, dtype=float) - self.y_eq)
+
+    @property
+    def frequencies(self) -> np.ndarray:
+        # Собственные частоты, Гц (по одной на пару сопряженных собственных значений)
+        return np.unique(np.round(np.abs(self.eigenvalues.imag), 12)) / (2 * np.pi)
+
+    def states(self, t) -> np.ndarray:
+        # Состояния формы (4,) + np.shape(t) без численного интегрирования
+        t = np.asarray(t, dtype=float)
+        phase = np.exp(np.multiply.outer(self.eigenvalues, t - self.t0))
+        coords = self.amplitudes.reshape((-1,) + (1,) * t.ndim) * phase
+        return np.tensordot(self.modes, coords, axes=1).real + self.y_eq.reshape((-1,) + (1,) * t.ndim)
+
+    def defect(self, t) -> np.ndarray:
+        # Невязка линейного решения в нелинейных уравнениях: f(y) - A (y - y_eq)
+        S = self.states(t)
+        return self.rhs(S) - np.tensordot(self.A, S - self.y_eq.reshape((-1,) + (1,) * np.ndim(t)), axes=1)
+
+    def error_estimate(self, t1: float) -> float:
+        # Оценка (не граница) ошибки на [t0, t1]: отклонение e нелинейного решения от
+        # линейного подчиняется e' = A e + d(t) + O(|e|^2), где d - невязка. Невязка берется
+        # на линейном решении, а e считается по модам: c_k(t) = интеграл exp(lambda_k (t - s))
+        # (V^-1 d(s))_k ds. Это главный член ошибки, порядка квадрата амплитуды; при l3.py
+        # и амплитудах до 1e-2 он совпадает с фактической ошибкой с точностью около 1%, при
+        # больших амплитудах на долгих интервалах (ошибка порядка амплитуды) занижен до 2 раз
+        fastest = np.abs(self.eigenvalues).max()
+        n = max(2, int(np.ceil(abs(t1 - self.t0) * fastest / (2 * np.pi) * NODES_PER_PERIOD)) + 1)
+        t = np.linspace(self.t0, t1, n)
+        s = (t - self.t0)[None, :]
+        lam = self.eigenvalues[:, None]
+        w = np.linalg.solve(self.modes, self.defect(t))
+        coords = np.exp(lam * s) * cumulative_trapezoid(np.exp(-lam * s) * w, t, axis=1, initial=0)
+        return float(np.abs((self.modes @ coords).real).max())
+
+
+# 3. Решение с автоматическим выбором: замкнутый вид или нелинейный расчет
+def solve(M, m, l, r, c, g, y0, t, tol: float = LINEAR_TOL, **kwargs):
+    # Возвращает (состояния (4, len(t)), {'method': 'modal' | 'nonlinear', 'error_estimate'}).
+    # kwargs передаются DenseSolution при переходе к нелинейному расчету
+    t = np.asarray(t, dtype=float)
+    modal = ModalSolution(M, m, l, r, c, g, y0, t[0])
+    estimate = modal.error_estimate(t[-1])
+    if estimate * ESTIMATE_SAFETY <= tol:
+        return modal.states(t), {'method': 'modal', 'error_estimate': estimate}
+    dense = DenseSolution(M, m, l, r, c, g, y0, t[0], t[-1], **kwargs)
+    return dense.states(t), {'method': 'nonlinear', 'error_estimate': estimate}
+
+
+def compare(M, m, l, r, c, g, y0, t) -> dict:
+    # Оценка ошибки и фактическое отклонение линейного решения от нелинейного
+    t = np.asarray(t, dtype=float)
+    modal = ModalSolution(M, m, l, r, c, g, y0, t[0])
+    reference = DenseSolution(M, m, l, r, c, g, y0, t[0], t[-1]).states(t)
+    return {
+        'error_estimate': modal.error_estimate(t[-1]),
+        'error': float(np.abs(modal.states(t) - reference).max()),
+        'frequencies': modal.frequencies,
+    }
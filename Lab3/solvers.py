@@ -0,0 +1,91 @@
+# Выбор метода решения по жесткости системы и сравнение методов на сетке параметров
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # common при запуске скриптом
+from dense import DenseSolution
+from dynamics import MotionEquations
+from sweep import PARAMS, make_grid
+
+# Явный метод для нежестких задач и метод с автоматическим переключением; неявные
+# методы (Radau, BDF) участвуют только в сравнении, см. select_method
+NONSTIFF = 'DOP853'
+SWITCHING = 'LSODA'
+METHODS = ('RK45', 'DOP853', 'LSODA', 'Radau', 'BDF')
+
+# Порог отношения быстрого и медленного масштабов времени
+SWITCH_RATIO = 50
+
+
+# 1. Оценка жесткости по собственным значениям матрицы Якоби
+def stiffness_probe(M, m, l, r, c, g, y0) -> dict:
+    # Собственные значения берутся в начальном состоянии и в положении покоя (phi = phi' = x' = 0).
+    # ratio - отношение самого быстрого масштаба времени к самому медленному
+    rhs = MotionEquations(M, m, l, r, c, g)
+    states = (np.asarray(y0, dtype=float), np.array([y0[0], 0.0, 0.0, 0.0]))
+    eig = np.concatenate([np.linalg.eigvals(rhs.jac(s).copy()) for s in states])
+    size = np.abs(eig)
+    nonzero = size[size > 1e-12]
+    return {
+        'eigenvalues': eig,
+        'ratio': float(nonzero.max() / nonzero.min()) if nonzero.size else 1.0,
+    }
+
+
+def select_method(M, m, l, r, c, g, y0) -> str:
+    # Близкие масштабы - явный метод высокого порядка, разделенные - LSODA, который сам
+    # переключается. Трения в системе нет, быстрые (пружинные) моды не затухают, и неявный
+    # метод при заданной точности следует им с тем же мелким шагом, но каждый шаг дороже:
+    # при m = 0.1, c = 5e7 на [0, 12] DOP853 справляется за 25 с, а Radau не укладывается и в 4 минуты.
+    # Поэтому выбираются только два метода
+    probe = stiffness_probe(M, m, l, r, c, g, y0)
+    return NONSTIFF if probe['ratio'] < SWITCH_RATIO else SWITCHING
+
+
+def solve(M, m, l, r, c, g, y0, t0: float, t1: float, method: str = 'auto', **kwargs) -> DenseSolution:
+    if method == 'auto':
+        method = select_method(M, m, l, r, c, g, y0)
+    return DenseSolution(M, m, l, r, c, g, y0, t0, t1, method=method, **kwargs)
+
+
+# 2. Сравнение методов: шаги, вычисления правой части и время на сетке параметров
+def benchmark(grid: dict, t1: float, methods=METHODS, rtol: float = 1e-8, atol: float = 1e-10,
+              n_check: int = 200) -> list:
+    # grid - сетка из sweep.make_grid. Для каждой точки и метода - строка с числом шагов,
+    # nfev, njev, временем решения и отклонением от эталона (DOP853 с rtol / 100)
+    rows = []
+    n = len(next(iter(grid.values())))
+    t_check = np.linspace(0, t1, n_check)
+    for j in range(n):
+        params = [grid[k][j] for k in PARAMS]
+        y0 = [grid['x0'][j], grid['phi0'][j], grid['dx0'][j], grid['dphi0'][j]]
+        auto = select_method(*params, y0)
+        reference = DenseSolution(*params, y0, 0, t1, rtol=rtol / 100, atol=atol / 100).states(t_check)
+        for method in methods:
+            start = time.perf_counter()
+            solution = DenseSolution(*params, y0, 0, t1, method=method, rtol=rtol, atol=atol)
+            elapsed = time.perf_counter() - start
+            rows.append({
+                **dict(zip(PARAMS, params)),
+                'method': method, 'auto': method == auto,
+                'steps': solution.nsteps, 'nfev': solution.nfev, 'njev': solution.njev,
+                'time': elapsed, 'error': float(np.max(np.abs(solution.states(t_check) - reference))),
+            })
+    return rows
+
+
+def format_table(rows: list) -> str:
+    lines = [f"{'m':>6} {'c':>8} {'method':>7} {'auto':>4} {'steps':>7} {'nfev':>8} {'njev':>5} "
+             f"{'time, s':>8} {'error':>9}"]
+    for row in rows:
+        lines.append(f"{row['m']:>6g} {row['c']:>8g} {row['method']:>7} {'*' if row['auto'] else '':>4} "
+                     f"{row['steps']:>7} {row['nfev']:>8} {row['njev']:>5} {row['time']:>8.4f} {row['error']:>9.2e}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    # Масса груза и жесткость пружины в диапазонах, встречающихся в расчетах
+    print(format_table(benchmark(make_grid(m=[0.1, 10], c=[50, 5000, 50000]), t1=np.pi)))
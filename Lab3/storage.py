@@ -0,0 +1,104 @@
+# Долгие расчеты с записью в отображаемый в память файл при постоянном расходе памяти
+import json
+import struct
+
+import numpy as np
+
+from stream import CHUNK, stream
+
+
+# 1. Формат файла: MAGIC, длина заголовка (uint64), JSON-заголовок, затем данные
+# float64 формы (n, len(COLUMNS)) построчно; начало данных выровнено на ALIGN байт
+MAGIC = b'OKMDSL3\x00'
+ALIGN = 64
+COLUMNS = ('x', 'phi', 'dx', 'dphi', 'N_eps', 'N_nu')
+PARAMS = ('M', 'm', 'l', 'r', 'c', 'g')
+
+# Число узлов сетки в одном сегменте: после сегмента решатель перезапускается
+# с последнего состояния, поэтому сетка времени целиком в памяти не строится
+SEGMENT = 1 << 20
+
+
+def _write_header(f, header: dict) -> int:
+    # Записывает заголовок и возвращает смещение начала данных
+    body = json.dumps(header).encode()
+    offset = -(-(len(MAGIC) + 8 + len(body)) // ALIGN) * ALIGN
+    body = body.ljust(offset - len(MAGIC) - 8)
+    f.write(MAGIC + struct.pack('<Q', len(body)) + body)
+    return offset
+
+
+def read_header(path: str) -> dict:
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path}: not a simulation file')
+        size, = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(size))
+    if header['n'] < 2:
+        raise ValueError(f'{path}: grid must have at least 2 nodes, got {header["n"]}')
+    header['offset'] = len(MAGIC) + 8 + size
+    return header
+
+
+# 2. Расчет с записью в файл
+def simulate_to_file(path: str, M, m, l, r, c, g, y0, t0: float, t1: float, n: int,
+                     segment: int = SEGMENT, chunk: int = CHUNK, method: str = 'DOP853',
+                     rtol: float = 1e-8, atol: float = 1e-10) -> dict:
+    # Равномерная сетка из n узлов на [t0, t1]; в файл пишутся x, phi, x', phi', N_eps, N_nu.
+    # В памяти находятся только текущий сегмент сетки и одна порция потокового решения
+    if n != int(n) or n < 2:
+        raise ValueError(f'n must be an integer >= 2 (grid includes both ends), got {n}')
+    if segment < 1:
+        raise ValueError(f'segment must be >= 1, got {segment}')
+    n = int(n)
+    params = (M, m, l, r, c, g)
+    header = {
+        'version': 1,
+        'params': dict(zip(PARAMS, map(float, params))),
+        'y0': [float(v) for v in y0],
+        't0': float(t0), 't1': float(t1), 'n': int(n),
+        'columns': list(COLUMNS),
+        'solver': {'method': method, 'rtol': rtol, 'atol': atol, 'segment': segment},
+    }
+    with open(path, 'wb') as f:
+        offset = _write_header(f, header)
+        f.truncate(offset + n * len(COLUMNS) * 8)
+    data = np.memmap(path, dtype='<f8', mode='r+', offset=offset, shape=(n, len(COLUMNS)))
+
+    dt = (t1 - t0) / (n - 1)
+    state = np.asarray(y0, dtype=float)
+    data[0, :4] = state
+    start = 0
+    while start < n - 1:
+        # Сегмент начинается с последнего записанного узла - его состояние и есть начальное
+        stop = min(start + segment, n - 1)
+        t = t0 + dt * np.arange(start, stop + 1)
+        row = start
+        for part in stream(*params, state, t, chunk=chunk, method=method, rtol=rtol, atol=atol):
+            k = len(part['t'])
+            block = data[row:row + k]
+            block[:, :4] = part['S'].T
+            block[:, 4] = part['N_eps']
+            block[:, 5] = part['N_nu']
+            row += k
+        state = data[stop, :4].copy()
+        data.flush()
+        start = stop
+    del data
+    return read_header(path)
+
+
+# 3. Чтение: данные отображаются в память, а не загружаются
+def open_run(path: str, mode: str = 'r'):
+    # Возвращает (заголовок, массив (n, len(COLUMNS)))
+    header = read_header(path)
+    data = np.memmap(path, dtype='<f8', mode=mode, offset=header['offset'],
+                     shape=(header['n'], len(header['columns'])))
+    return header, data
+
+
+def time_grid(header: dict, start: int = 0, stop: int = None) -> np.ndarray:
+    # Моменты времени для строк [start, stop) файла
+    stop = header['n'] if stop is None else stop
+    dt = (header['t1'] - header['t0']) / (header['n'] - 1)
+    return header['t0'] + dt * np.arange(start, stop)
@@ -0,0 +1,52 @@
+# Потоковое решение: состояния, ускорения и реакции порциями по мере продвижения решателя
+import numpy as np
+import scipy.integrate
+
+from dynamics import MotionEquations, ivp_functions, reactions
+
+# Число узлов сетки в одной порции
+CHUNK = 1024
+
+
+def stream(M, m, l, r, c, g, y0, t, chunk: int = CHUNK, method: str = 'DOP853',
+           rtol: float = 1e-8, atol: float = 1e-10):
+    # Генератор порций {'t', 'S' (4, k), 'dS' (4, k), 'N_eps' (k,), 'N_nu' (k,)} на узлах сетки t.
+    # Решатель делает шаги по точности, узлы сетки внутри каждого шага заполняются его
+    # локальным интерполянтом. В памяти одновременно находится не больше одной порции:
+    # выдаваемые массивы - представления буферов, которые переиспользуются для следующей
+    # порции, поэтому сохранять их нужно копией
+    params = (M, m, l, r, c, g)
+    rhs = MotionEquations(*params)
+    t = np.asarray(t, dtype=float)
+    solver = getattr(scipy.integrate, method)(t0=t[0], y0=y0, t_bound=t[-1], rtol=rtol, atol=atol,
+                                              **ivp_functions(rhs, method))
+
+    T = np.empty(chunk)
+    S = np.empty((4, chunk))
+
+    def emit(k):
+        dS = rhs(S[:, :k])
+        N_eps, N_nu = reactions(S[:, :k], dS, *params)
+        return {'t': T[:k], 'S': S[:, :k], 'dS': dS, 'N_eps': N_eps, 'N_nu': N_nu}
+
+    # Начальный узел; i - следующий узел сетки, filled - заполненная часть порции
+    T[0], S[:, 0] = t[0], y0
+    filled, i = 1, 1
+    while i < len(t):
+        if filled == chunk:
+            yield emit(filled)
+            filled = 0
+        if solver.status == 'running' and solver.t < t[i]:
+            message = solver.step()
+            if solver.status == 'failed':
+                raise RuntimeError(message)
+            interpolant = solver.dense_output()
+        # Узлы, пройденные последним шагом, - но не больше, чем помещается в порцию
+        stop = min(int(np.searchsorted(t, solver.t, side='right')), i + chunk - filled)
+        if stop > i:
+            T[filled:filled + stop - i] = t[i:stop]
+            S[:, filled:filled + stop - i] = interpolant(t[i:stop])
+            filled += stop - i
+            i = stop
+    if filled:
+        yield emit(filled)
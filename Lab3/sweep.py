@@ -0,0 +1,98 @@
+# Параллельный перебор параметров модели и начальных условий
+import multiprocessing
+import os
+import tempfile
+
+import numpy as np
+
+from common.grid import cartesian
+from dynamics import MotionEquations, reactions
+from ensemble import integrate_ensemble
+
+
+# 1. Значения по умолчанию (как в l3.py), сохраняемые величины и сводные показатели
+DEFAULTS = {'M': 1, 'm': 10, 'r': 0.4, 'l': 1, 'c': 50, 'g': 9.81,
+            'x0': 0.02, 'phi0': np.pi / 6, 'dx0': 0, 'dphi0': 0}
+PARAMS = ('M', 'm', 'l', 'r', 'c', 'g')  # порядок аргументов MotionEquations
+FIELDS = ('x', 'phi', 'N_eps', 'N_nu')
+STATS = ('max_abs_N_nu', 'min_N_nu', 'max_phi')
+
+# Число точек сетки, интегрируемых одним векторизованным вызовом
+BATCH = 256
+
+
+# 2. Построение сетки: декартово произведение заданных осей
+def make_grid(**axes) -> dict:
+    # make_grid(c=np.linspace(20, 80, 100), phi0=...) - остальные величины берутся из DEFAULTS
+    return cartesian(DEFAULTS, **axes)
+
+
+# 3. Работа процесса: интегрирование части сетки и запись прямо в общий файл
+_state = None
+
+
+def _init_worker(grid, t, path, shape, fields, method):
+    global _state
+    _state = (grid, t, path, shape, fields, method)
+
+
+def _run_batch(bounds):
+    grid, t, path, shape, fields, method = _state
+    start, stop = bounds
+    p = {k: v[start:stop] for k, v in grid.items()}
+    params = [p[k] for k in PARAMS]
+
+    Y0 = np.stack([p['x0'], p['phi0'], p['dx0'], p['dphi0']], axis=1)
+    S = integrate_ensemble(Y0, t, *params, method=method).transpose(2, 0, 1)  # (4, n_t, B)
+    N_eps, N_nu = reactions(S, MotionEquations(*params)(S), *params)
+    values = {'x': S[0], 'phi': S[1], 'N_eps': N_eps, 'N_nu': N_nu}
+
+    if fields:
+        out = np.memmap(path, dtype=np.float64, mode='r+', shape=shape)
+        for j, name in enumerate(fields):
+            out[start:stop, j] = values[name].T
+        out.flush()
+        del out
+
+    # Родителю возвращаются только сводные показатели, не траектории
+    return start, np.stack([np.abs(N_nu).max(axis=0), N_nu.min(axis=0), S[1].max(axis=0)], axis=1)
+
+
+# 4. Запуск перебора
+def run_sweep(grid: dict, t, path: str = None, fields=FIELDS, workers: int = None,
+              batch: int = BATCH, method: str = 'dopri5'):
+    # Возвращает (data, stats): data - отображенный в память массив (n_points, len(fields), len(t))
+    # или None при fields=(); stats - массив (n_points, len(STATS)).
+    # Без path данные пишутся во временный файл в /dev/shm (разделяемая память), который
+    # удаляется сразу после расчета - отображение в родительском процессе остается действительным
+    t = np.asarray(t, dtype=float)
+    fields = tuple(fields)
+    n = len(next(iter(grid.values())))
+    shape = (n, len(fields), len(t))
+
+    temporary = path is None and bool(fields)
+    if temporary:
+        shm = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        fd, path = tempfile.mkstemp(suffix='.sweep', dir=shm)
+        os.close(fd)
+    if fields:
+        np.memmap(path, dtype=np.float64, mode='w+', shape=shape).flush()
+
+    bounds = [(s, min(s + batch, n)) for s in range(0, n, batch)]
+    stats = np.empty((n, len(STATS)))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(bounds)))
+    initargs = (grid, t, path, shape, fields, method)
+    if workers > 1:
+        with multiprocessing.Pool(workers, _init_worker, initargs) as pool:
+            for start, block in pool.imap_unordered(_run_batch, bounds):
+                stats[start:start + len(block)] = block
+    else:
+        _init_worker(*initargs)
+        for b in bounds:
+            start, block = _run_batch(b)
+            stats[start:start + len(block)] = block
+
+    data = np.memmap(path, dtype=np.float64, mode='r+', shape=shape) if fields else None
+    if temporary:
+        os.remove(path)
+    return data, stats
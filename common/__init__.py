@@ -0,0 +1 @@
+# Общие средства отрисовки анимаций для всех лабораторных работ
@@ -0,0 +1,24 @@
+# Параметры командной строки, общие для всех анимаций
+import argparse
+
+import matplotlib
+
+
+def parse_args(argv=None):
+    # Разбор аргументов; при экспорте выбирается Agg, чтобы работать без дисплея.
+    # Вызывать до создания первой фигуры
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--export', metavar='PATH',
+                        help='сохранить кадры в каталог PATH (PNG) или в файл PATH.gif вместо показа; '
+                             'неизменяемые фигуры - в PATH/static_J.png или PATH_J.png')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='число процессов для экспорта (по умолчанию - число ядер)')
+    parser.add_argument('--dpi', type=int, default=100, help='разрешение экспортируемых кадров')
+    parser.add_argument('--fps', type=float, default=30, help='частота кадров GIF')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='скорость воспроизведения относительно реального времени')
+    args = parser.parse_args(argv)
+
+    if args.export:
+        matplotlib.use('Agg')
+    return args
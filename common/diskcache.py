@@ -0,0 +1,55 @@
+# Общие операции дисковых кэшей: атомарная запись и вытеснение давно не использованных записей
+import os
+
+
+def atomic_write(path: str, write, mode: str = 'wb'):
+    # write(f) пишет содержимое во временный файл рядом с path, который затем одной
+    # операцией заменяет path, поэтому параллельные запуски не видят половину записи.
+    # При ошибке временный файл удаляется
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, mode) as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def touch(path: str):
+    # Отметка последнего использования записи: вытеснение идет по времени изменения.
+    # Запись могла быть вытеснена параллельным запуском уже после чтения - это не ошибка
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def entries(cache_dir: str, suffix: str) -> list:
+    # Записи кэша [(время изменения, размер, путь)] от давно не использованных к недавним
+    found = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(suffix):
+            path = os.path.join(cache_dir, name)
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:  # удалена параллельным запуском
+                continue
+            found.append((info.st_mtime, info.st_size, path))
+    found.sort()
+    return found
+
+
+def evict(cache_dir: str, suffix: str, max_bytes: int):
+    # Удаление давно не использованных записей с окончанием suffix, пока кэш не уложится в max_bytes
+    found = entries(cache_dir, suffix)
+    total = sum(size for _, size, _ in found)
+    for _, size, path in found:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
@@ -0,0 +1,86 @@
+# Экспорт анимации в последовательность PNG-кадров или GIF без дисплея
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Задание экспорта; процессы-исполнители получают его (вместе с фигурой) при fork
+_job = None
+
+
+def frame_path(out_dir: str, k: int) -> str:
+    return os.path.join(out_dir, f'frame_{k:05d}.png')
+
+
+def _render_range(bounds):
+    # Отрисовка кадров с номерами [start, stop) в отдельном процессе
+    fig, update, frames, out_dir, dpi = _job
+    start, stop = bounds
+    for k in range(start, stop):
+        update(frames[k])
+        fig.savefig(frame_path(out_dir, k), dpi=dpi)
+
+
+def static_path(path: str, j: int) -> str:
+    # Неизменяемая фигура j: рядом с кадрами в каталоге PATH или как PATH_j.png рядом с PATH.gif
+    if path.lower().endswith('.gif'):
+        return f'{path[:-4]}_{j}.png'
+    return os.path.join(path, f'static_{j}.png')
+
+
+def _write_gif(path: str, names, fps: float):
+    # Кадры дописываются в файл по одному, каждый со своей палитрой: в памяти только
+    # текущий кадр (Image.save(save_all=True) сначала собирает в памяти все кадры)
+    from PIL import GifImagePlugin, Image
+    with open(path, 'wb') as fp:
+        for k, name in enumerate(names):
+            with Image.open(name) as image:
+                frame = image.convert('RGB').convert('P', palette=Image.Palette.ADAPTIVE)
+            if k == 0:
+                header, _ = GifImagePlugin.getheader(frame, info={'loop': 0})
+                fp.writelines(header)
+            fp.writelines(GifImagePlugin.getdata(frame, duration=round(1000 / fps), include_color_table=True))
+        fp.write(b';')  # конец файла GIF
+
+
+def export_animation(fig, update, frames, path: str, workers: int = None, dpi: int = 100, fps: float = 30,
+                     static=()):
+    # update(i) должна зависеть только от номера кадра, как функции animate/run в лабораторных.
+    # Диапазон кадров делится на непрерывные части по числу процессов; кадр k всегда
+    # записывается в frame_{k:05d}.png, поэтому порядок не зависит от планирования процессов.
+    # static - остальные фигуры сцены, которые update не меняет (графики, построенные
+    # заранее): каждая сохраняется один раз в static_path(path, j), j = 1, 2, ...
+    # Возвращает список записанных файлов
+    global _job
+    frames = list(range(frames)) if isinstance(frames, int) else list(frames)
+    gif = path.lower().endswith('.gif')
+    os.makedirs(os.path.dirname(os.path.abspath(path)) if gif else path, exist_ok=True)
+    out_dir = tempfile.mkdtemp() if gif else path
+    try:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(frames)))
+        bounds = [(int(part[0]), int(part[-1]) + 1)
+                  for part in np.array_split(np.arange(len(frames)), workers) if len(part)]
+        _job = (fig, update, frames, out_dir, dpi)
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                pool.map(_render_range, bounds)
+        else:
+            # Без fork фигуру нельзя передать процессам - отрисовка в текущем процессе
+            for b in bounds:
+                _render_range(b)
+
+        written = [frame_path(out_dir, k) for k in range(len(frames))]
+        if gif:
+            _write_gif(path, written, fps)
+            written = [path]
+    finally:
+        _job = None
+        if gif:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    for j, other in enumerate(static, start=1):
+        written.append(static_path(path, j))
+        other.savefig(written[-1], dpi=dpi)
+    return written
@@ -0,0 +1,17 @@
+# Сетки параметров для пакетных расчетов
+import numpy as np
+
+
+def cartesian(defaults: dict, **axes) -> dict:
+    # Декартово произведение осей: cartesian(DEFAULTS, c=np.linspace(20, 80, 100), phi0=[0.1, 0.2])
+    # возвращает {имя: массив длины 100 * 2} для всех имен defaults; величины без оси
+    # берутся из defaults. Первая ось меняется медленнее всех (indexing='ij')
+    unknown = set(axes) - set(defaults)
+    if unknown:
+        raise ValueError(f'unknown grid axes: {sorted(unknown)}')
+    names = list(axes)
+    mesh = np.meshgrid(*(np.atleast_1d(np.asarray(axes[k], dtype=float)) for k in names), indexing='ij')
+    n = mesh[0].size if mesh else 1
+    grid = {k: np.full(n, float(v)) for k, v in defaults.items()}
+    grid.update({k: v.ravel() for k, v in zip(names, mesh)})
+    return grid
@@ -0,0 +1,108 @@
+# Воспроизведение анимации в реальном времени независимо от скорости отрисовки
+import time
+
+import numpy as np
+
+
+class PlaybackClock:
+    # Сопоставляет настенное время модельному: на каждом такте показывается кадр,
+    # соответствующий текущему моменту, а не следующий по порядку. Если отрисовка
+    # не успевает, промежуточные кадры пропускаются и учитываются в dropped
+    def __init__(self, times: np.ndarray, speed: float = 1.0, interpolate: bool = False, clock=time.perf_counter):
+        self.times = np.asarray(times, dtype=float)
+        self.speed = speed  # отношение модельного времени к настенному
+        self.interpolate = interpolate
+        self.clock = clock
+        self.shown = 0
+        self.dropped = 0
+
+    def frames(self):
+        # Генератор кадров для FuncAnimation(frames=clock.frames) на один проход по времени.
+        # Выдает номер кадра или, при interpolate=True, дробную позицию между кадрами
+        # (значения между отсчетами получаются функцией lerp)
+        start = self.clock()
+        last = -1
+        while True:
+            sim = self.times[0] + self.speed * (self.clock() - start)
+            if sim >= self.times[-1]:
+                break
+            i = int(np.searchsorted(self.times, sim, side='right')) - 1
+            if i > last + 1:
+                self.dropped += i - last - 1
+            self.shown += i > last
+            last = i
+            if self.interpolate:
+                yield i + float((sim - self.times[i]) / (self.times[i + 1] - self.times[i]))
+            else:
+                yield i
+        # Последний кадр показывается всегда, чтобы проход заканчивался конечным состоянием
+        self.dropped += len(self.times) - 1 - last - 1
+        self.shown += 1
+        yield len(self.times) - 1
+
+    def report(self) -> str:
+        total = self.shown + self.dropped
+        share = 100 * self.dropped / total if total else 0
+        return f'shown {self.shown} frames, dropped {self.dropped} ({share:.1f}%) at speed x{self.speed:g}'
+
+
+class StreamClock:
+    # То же сопоставление времени для неограниченного потока порций: порции берутся
+    # из итератора по мере продвижения настенного времени, поэтому первый кадр показывается
+    # сразу, а в памяти находится только текущая порция
+    def __init__(self, speed: float = 1.0, clock=time.perf_counter):
+        self.speed = speed
+        self.clock = clock
+        self.shown = 0
+        self.dropped = 0
+
+    def frames(self, chunks):
+        # chunks - итератор порций с моментами времени part['t'].
+        # Выдает (порция, номер отсчета в ней, срез отсчетов, пройденных с прошлого кадра)
+        start = None
+        for part in chunks:
+            times = part['t']
+            if start is None:
+                start = self.clock() - times[0] / self.speed
+            last = -1
+            while last < len(times) - 1:
+                sim = self.speed * (self.clock() - start)
+                i = min(max(int(np.searchsorted(times, sim, side='right')) - 1, 0), len(times) - 1)
+                if i > last + 1:
+                    self.dropped += i - last - 1
+                self.shown += i > last
+                passed = slice(last + 1, max(i, last) + 1)
+                last = max(i, last)
+                yield part, last, passed
+
+    def report(self) -> str:
+        total = self.shown + self.dropped
+        share = 100 * self.dropped / total if total else 0
+        return f'shown {self.shown} frames, dropped {self.dropped} ({share:.1f}%) at speed x{self.speed:g}'
+
+
+def uniform_positions(times: np.ndarray, fps: float, speed: float = 1.0) -> np.ndarray:
+    # Дробные позиции кадров (для lerp) на равномерной сетке модельного времени: fps кадров
+    # в секунду при скорости speed. Нужны при экспорте неравномерных отсчетов: кадр на
+    # каждый отсчет при постоянной частоте GIF замедлял бы движение там, где отсчеты гуще
+    times = np.asarray(times, dtype=float)
+    n = max(2, int(round((times[-1] - times[0]) * fps / speed)) + 1)
+    return np.interp(np.linspace(times[0], times[-1], n), times, np.arange(len(times)))
+
+
+def lerp(values: np.ndarray, position: float, out: np.ndarray = None):
+    # Строка массива в позиции кадра; функция кадра, принимающая позиции
+    # PlaybackClock(interpolate=True), берет строки через lerp, а не [i].
+    # Целая позиция - представление values[i] без вычислений; дробная - линейная
+    # интерполяция соседних строк, записываемая в out (буфер формы values[0].shape),
+    # поэтому при заранее выделенном out кадр тоже обходится без выделения памяти
+    i = int(position)
+    w = position - i
+    if w == 0 or i >= len(values) - 1:
+        return values[min(i, len(values) - 1)]
+    if out is None:
+        out = np.empty_like(values[i])
+    np.subtract(values[i + 1], values[i], out=out)
+    out *= w
+    out += values[i]
+    return out
@@ -0,0 +1,33 @@
+# Кольцевой буфер последних отсчетов для графиков неограниченных по времени расчетов
+import numpy as np
+
+
+class RingBuffer:
+    # Хранит последние capacity отсчетов n_fields величин. Каждый отсчет пишется дважды
+    # (в позиции k и k + capacity), поэтому view() - непрерывное представление в порядке
+    # времени без копирования; память постоянна при любой длительности расчета
+    def __init__(self, capacity: int, n_fields: int):
+        self.capacity = capacity
+        self._data = np.empty((n_fields, 2 * capacity))
+        self._end = 0  # позиция следующей записи в [0, capacity)
+        self.size = 0
+
+    def clear(self):
+        self._end = 0
+        self.size = 0
+
+    def extend(self, block: np.ndarray):
+        # block формы (n_fields, k): k новых отсчетов
+        block = np.asarray(block, dtype=float)[:, -self.capacity:]
+        k = block.shape[1]
+        first = min(k, self.capacity - self._end)  # часть до конца кольца
+        for offset in (0, self.capacity):
+            self._data[:, offset + self._end:offset + self._end + first] = block[:, :first]
+            self._data[:, offset:offset + k - first] = block[:, first:]
+        self._end = (self._end + k) % self.capacity
+        self.size = min(self.size + k, self.capacity)
+
+    def view(self) -> np.ndarray:
+        # Последние size отсчетов формы (n_fields, size), от старых к новым
+        start = self._end + self.capacity - self.size
+        return self._data[:, start:start + self.size]
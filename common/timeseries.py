@@ -0,0 +1,92 @@
+# Графики временных рядов, дополняемые по кадрам, с прореживанием до ширины осей в пикселях
+import numpy as np
+
+
+class DecimatedLine:
+    # Интервал [t0, t1] делится на столько корзин, сколько пикселей в ширине осей; в каждой
+    # корзине хранятся только минимум и максимум (вместе с их моментами времени), поэтому
+    # линия состоит не более чем из 2 * buckets точек при любой длине ряда, а новые отсчеты
+    # обрабатываются без пересчета старых. Пики и провалы при этом не теряются
+    def __init__(self, line, t0: float, t1: float, buckets: int = None):
+        self.line = line
+        self.t0, self.t1 = t0, t1
+        self.n = buckets  # без buckets - ширина осей, когда она станет известна
+        self._x = None
+        self.reset()
+
+    def _allocate(self):
+        # Ширина осей окончательна только после компоновки фигуры (tight_layout перед
+        # показом или экспортом), поэтому корзины заводятся при первом добавлении отсчетов
+        self.n = self.n or max(1, int(self.line.axes.bbox.width))
+        self.step = (self.t1 - self.t0) / self.n
+        self._lo_t, self._lo_y = np.empty(self.n), np.empty(self.n)
+        self._hi_t, self._hi_y = np.empty(self.n), np.empty(self.n)
+        self._x, self._y = np.empty(2 * self.n), np.empty(2 * self.n)
+
+    def reset(self):
+        self.used = 0  # число заполненных корзин
+        self._bucket = -1  # номер последней заполненной корзины
+        self.line.set_data([], [])
+
+    def extend(self, t, y):
+        # Добавляет отсчеты (t, y); моменты t возрастают и не меньше уже добавленных
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        if not len(t):
+            return
+        if self._x is None:
+            self._allocate()
+        b = np.clip(((t - self.t0) / self.step).astype(int), 0, self.n - 1)
+
+        # Отсчеты одной корзины идут подряд; после сортировки по (корзина, значение)
+        # первый отсчет группы - минимум, последний - максимум
+        starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+        ends = np.r_[starts[1:], len(b)]
+        order = np.lexsort((y, b))
+        i_lo, i_hi = order[starts], order[ends - 1]
+
+        lo_t, lo_y, hi_t, hi_y = self._lo_t, self._lo_y, self._hi_t, self._hi_y
+        first = self.used
+        if self.used and b[0] == self._bucket:
+            # Первая группа продолжает последнюю заполненную корзину
+            k = self.used - 1
+            if y[i_lo[0]] < lo_y[k]:
+                lo_t[k], lo_y[k] = t[i_lo[0]], y[i_lo[0]]
+            if y[i_hi[0]] >= hi_y[k]:
+                hi_t[k], hi_y[k] = t[i_hi[0]], y[i_hi[0]]
+            i_lo, i_hi = i_lo[1:], i_hi[1:]
+            first -= 1
+        new = slice(self.used, self.used + len(i_lo))
+        lo_t[new], lo_y[new] = t[i_lo], y[i_lo]
+        hi_t[new], hi_y[new] = t[i_hi], y[i_hi]
+        self.used += len(i_lo)
+        self._bucket = b[-1]
+
+        # Точки измененных корзин: минимум и максимум в порядке времени
+        changed = slice(first, self.used)
+        swap = lo_t[changed] > hi_t[changed]
+        self._x[2 * first:2 * self.used:2] = np.where(swap, hi_t[changed], lo_t[changed])
+        self._y[2 * first:2 * self.used:2] = np.where(swap, hi_y[changed], lo_y[changed])
+        self._x[2 * first + 1:2 * self.used:2] = np.where(swap, lo_t[changed], hi_t[changed])
+        self._y[2 * first + 1:2 * self.used:2] = np.where(swap, lo_y[changed], hi_y[changed])
+        self.line.set_data(self._x[:2 * self.used], self._y[:2 * self.used])
+
+
+class ProgressiveLine(DecimatedLine):
+    # Заранее посчитанный ряд (t, y), показываемый до отсчета i: show(i) заменяет
+    # line.set_data(t[:i], y[:i]) и добавляет только отсчеты, пройденные с прошлого кадра.
+    # Результат зависит только от i, поэтому годится и для экспорта кадров в любом порядке
+    def __init__(self, line, t, y, buckets: int = None):
+        self.t = np.asarray(t, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        super().__init__(line, self.t[0], self.t[-1], buckets)
+
+    def reset(self):
+        super().reset()
+        self.shown = 0
+
+    def show(self, i: int):
+        if i < self.shown:
+            self.reset()
+        self.extend(self.t[self.shown:i], self.y[self.shown:i])
+        self.shown = i
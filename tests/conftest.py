@@ -0,0 +1,7 @@
+# Модули лабораторных импортируются так же, как их импортируют скрипты: из своего каталога
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+for directory in ('Lab1', 'Lab2', 'Lab3', ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(ROOT, directory)))
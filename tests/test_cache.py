@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pytest
+
+import cache
+
+PARAMS = (1, 10, 1, 0.4, 50, 9.81)  # M, m, l, r, c, g как в l3.py
+Y0 = [0.02, np.pi / 6, 0, 0]
+T = np.linspace(0, 2, 50)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return cache.SimulationCache(str(tmp_path))
+
+
+def test_repeated_solve_is_a_hit(store):
+    first = store.solve(*PARAMS, Y0, T)
+    second = store.solve(*PARAMS, Y0, T)
+    assert first.shape == (len(cache.COLUMNS), len(T))
+    assert np.array_equal(first, second)
+    stats = store.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5 and stats['bytes'] > first.nbytes
+
+
+def test_key_changes_miss(store, monkeypatch):
+    store.solve(*PARAMS, Y0, T)
+    store.solve(*PARAMS, Y0, T, rtol=1e-9)
+    store.solve(*PARAMS, [0.03] + Y0[1:], T)
+    monkeypatch.setattr(cache, 'RHS_VERSION', cache.RHS_VERSION + 1)
+    store.solve(*PARAMS, Y0, T)
+    assert store.hits == 0 and store.misses == 4 and store.stats()['entries'] == 4
+
+
+def test_entry_evicted_after_read_is_still_a_hit(store, monkeypatch):
+    expected = store.solve(*PARAMS, Y0, T)
+    load = np.load
+
+    def load_then_evict(path):
+        result = load(path)
+        os.remove(path)  # параллельный запуск вытесняет запись между чтением и отметкой
+        return result
+
+    monkeypatch.setattr(np, 'load', load_then_evict)
+    assert np.array_equal(store.solve(*PARAMS, Y0, T), expected)
+    assert store.hits == 1
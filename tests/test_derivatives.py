@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import derivatives as d
+import mechanism
+
+
+def test_jet_matches_analytic_derivatives():
+    t = np.linspace(0, 4 * np.pi, 101)
+    f, f1, f2 = d.differentiate(lambda t: d.sin(t) * d.exp(t / 4) / d.sqrt(2 + d.cos(t)), t)
+    g = lambda t: np.sin(t) * np.exp(t / 4) / np.sqrt(2 + np.cos(t))  # noqa: E731
+    h = 1e-4
+    assert np.allclose(f, g(t))
+    assert np.allclose(f1, (g(t + h) - g(t - h)) / (2 * h), atol=1e-6)
+    assert np.allclose(f2, (g(t + h) - 2 * g(t) + g(t - h)) / h ** 2, atol=1e-4)
+
+
+def test_constant_law():
+    f, f1, f2 = d.differentiate(lambda t: 3.0, np.zeros(4))
+    assert f == 3.0 and np.all(f1 == 0) and np.all(f2 == 0)
+
+
+def test_point_A_velocity_against_finite_difference():
+    t = np.linspace(0, 2 * np.pi, 2001)
+    values = mechanism.point_A(t, *(mechanism.DEFAULTS[k] for k in mechanism.DESIGN))
+    assert np.abs(d.finite_difference(values['Xa'][0], t) - values['vx'][0]).max() < 1e-9
+    assert np.abs(d.finite_difference(values['Ya'][0], t, order=2) - values['ay'][0]).max() < 1e-7
+
+
+def test_fornberg_classic_stencil():
+    w = d.fornberg_weights(0.0, np.array([-1.0, 0.0, 1.0]), 2)
+    assert np.allclose(w, [[0, 1, 0], [-0.5, 0, 0.5], [1, -2, 1]])
+
+
+@pytest.mark.parametrize('uniform', [True, False])
+def test_finite_difference_accuracy(uniform):
+    t = np.linspace(0, 3, 301)
+    if not uniform:
+        t = t + 0.003 * np.sin(7 * t)
+    y = np.stack([np.sin(t), np.exp(-t)])
+    first = d.finite_difference(y, t)
+    second = d.finite_difference(y, t, order=2)
+    assert np.abs(first - np.stack([np.cos(t), -np.exp(-t)])).max() < 1e-8
+    assert np.abs(second - np.stack([-np.sin(t), np.exp(-t)])).max() < 1e-6
+
+
+@pytest.mark.parametrize('n, order, accuracy', [(1, 1, 6), (6, 1, 6), (3, 2, 2)])
+def test_finite_difference_too_few_nodes(n, order, accuracy):
+    t = np.linspace(0, 1, n)
+    with pytest.raises(ValueError, match='nodes'):
+        d.finite_difference(np.sin(t), t, order=order, accuracy=accuracy)
+
+
+def test_finite_difference_minimal_nodes():
+    t = np.linspace(0, 1, 4)  # ровно accuracy + order узлов
+    assert np.allclose(d.finite_difference(t ** 2, t, order=2, accuracy=2), 2)
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from common import diskcache
+
+
+def make_entry(directory, name, size, mtime):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    d = str(tmp_path)
+    old = make_entry(d, 'a.npy', 100, 1000)
+    used = make_entry(d, 'b.npy', 100, 2000)
+    new = make_entry(d, 'c.npy', 100, 3000)
+    other = make_entry(d, 'd.json', 1000, 0)  # записи другого вида не учитываются
+
+    diskcache.touch(old)  # чтение записи делает ее самой свежей
+    diskcache.evict(d, '.npy', 250)
+    assert os.path.exists(old) and os.path.exists(new) and os.path.exists(other)
+    assert not os.path.exists(used)
+    assert [size for _, size, _ in diskcache.entries(d, '.npy')] == [100, 100]
+
+
+def test_atomic_write_replaces_or_leaves_nothing(tmp_path):
+    path = str(tmp_path / 'entry.json')
+    diskcache.atomic_write(path, lambda f: f.write('{"a": 1}'), mode='w')
+
+    def broken(f):
+        f.write('{"a": ')
+        raise RuntimeError('interrupted')
+
+    with pytest.raises(RuntimeError):
+        diskcache.atomic_write(path, broken, mode='w')
+    with open(path) as f:
+        assert f.read() == '{"a": 1}'
+    assert os.listdir(tmp_path) == ['entry.json']
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+
+from dynamics import MotionEquations
+from ensemble import integrate_ensemble
+
+PARAMS = (1, 10, 1, 0.4, 50, 9.81)  # M, m, l, r, c, g как в l3.py
+Y0 = [0.02, np.pi / 6, 0, 0]
+T = np.linspace(0, 2 * np.pi, 101)
+
+
+@pytest.fixture(scope='module')
+def reference():
+    rhs = MotionEquations(*PARAMS)
+    return odeint(rhs, Y0, T, Dfun=rhs.jac, rtol=1e-11, atol=1e-12)
+
+
+@pytest.mark.parametrize('method, tol', [('dopri5', 1e-5), ('rk4', 1e-4)])
+def test_single_state_matches_odeint(reference, method, tol):
+    single = integrate_ensemble(Y0, T, *PARAMS, method=method)
+    assert single.shape == (len(T), 4)
+    assert np.abs(single - reference).max() < tol
+
+    batch = integrate_ensemble([Y0], T, *PARAMS, method=method)
+    assert batch.shape == (len(T), 1, 4)
+    assert np.array_equal(batch[:, 0], single)
+
+
+def test_members_are_independent(reference):
+    Y = np.array([Y0, [0.0, 0.3, 0.1, 0.0], Y0])
+    out = integrate_ensemble(Y, T, *PARAMS, rtol=1e-9, atol=1e-12)
+    assert np.abs(out[:, 0] - reference).max() < 1e-6
+    assert np.abs(out[:, 2] - reference).max() < 1e-6
+
+
+def test_bad_shape_rejected():
+    with pytest.raises(ValueError):
+        integrate_ensemble(np.zeros((2, 3)), T, *PARAMS)
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')  # деление на c = 0 в MotionEquations
+def test_failed_member_does_not_stall_the_batch(reference):
+    # c = 0: правая часть сразу не число; член выбывает, остальные считаются как обычно
+    out = integrate_ensemble([Y0, Y0], T, 1, 10, 1, 0.4, [50, 0], 9.81, rtol=1e-9, atol=1e-12)
+    assert np.all(np.isnan(out[1:, 1]))
+    assert np.abs(out[:, 0] - reference).max() < 1e-6
+
+
+def test_step_budget():
+    with pytest.raises(RuntimeError):
+        integrate_ensemble(Y0, T, *PARAMS, rtol=1e-12, atol=1e-14, max_steps=20)
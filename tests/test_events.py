@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from events import find_events
+
+PARAMS = (1, 10, 1, 0.4, 50, 9.81)  # M, m, l, r, c, g как в l3.py
+Y0 = [0.02, np.pi / 6, 0, 0]
+
+
+def test_terminal_event_outside_events_list():
+    # 'phi' не перечислено в events, но останавливает расчет в нижнем положении
+    result = find_events(*PARAMS, Y0, 0, 10, events=('dphi',), terminal=('phi',))
+    assert result['stopped'] == 'phi'
+    assert 0 < result['t_final'] < 10
+    assert abs(result['y_final'][1]) < 1e-8
+    assert set(result['events']) == {'dphi', 'phi'}
+
+
+def test_angle_extrema_alternate():
+    result = find_events(*PARAMS, Y0, 0, 10, events=('dphi',))
+    times, states = result['events']['dphi']
+    assert result['stopped'] is None and result['t_final'] == 10
+    assert len(times) >= 2 and np.all(np.diff(times) > 0)
+    assert np.all(np.abs(states[:, 3]) < 1e-6)
+    assert np.all(np.sign(states[:-1, 1]) != np.sign(states[1:, 1]))
+
+
+def test_unknown_event_rejected():
+    with pytest.raises(ValueError):
+        find_events(*PARAMS, Y0, 0, 1, terminal=('contact',))
@@ -0,0 +1,68 @@
+import os
+import tempfile
+
+import matplotlib
+import numpy as np
+import pytest
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plot  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from common import export  # noqa: E402
+
+
+@pytest.fixture
+def scene():
+    fig, ax = plot.subplots(figsize=(2, 2))
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+    line, = ax.plot([], [], 'k-', linewidth=8)
+
+    def update(i):
+        line.set_data([0, 1], [i / 4, i / 4])
+        return [line]
+
+    yield fig, update
+    plot.close('all')
+
+
+def test_gif_frames_and_static_figure(scene, tmp_path):
+    fig, update = scene
+    graphs = plot.figure(figsize=(2, 1))
+    path = str(tmp_path / 'anim.gif')
+    written = export.export_animation(fig, update, 5, path, workers=1, dpi=40, fps=20, static=[graphs])
+    assert written == [path, export.static_path(path, 1)]
+    with Image.open(path) as gif:
+        assert gif.n_frames == 5
+        assert gif.info['loop'] == 0 and gif.info['duration'] == 50
+        rows = []
+        for k in range(5):
+            gif.seek(k)
+            dark = np.asarray(gif.convert('L')).min(axis=1) < 128
+            rows.append(np.flatnonzero(dark).mean())
+    assert np.all(np.diff(rows) < 0)  # линия поднимается от кадра к кадру
+    assert os.path.isfile(export.static_path(path, 1))
+
+
+def test_png_directory(scene, tmp_path):
+    fig, update = scene
+    written = export.export_animation(fig, update, 3, str(tmp_path), workers=1, dpi=40)
+    assert written == [export.frame_path(str(tmp_path), k) for k in range(3)]
+    assert all(os.path.isfile(name) for name in written)
+
+
+def test_temporary_frames_removed_on_failure(scene, tmp_path, monkeypatch):
+    fig, update = scene
+
+    def broken(i):
+        if i == 2:
+            raise RuntimeError('render failed')
+        return update(i)
+
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path / 'tmp'))
+    os.makedirs(tempfile.tempdir)
+    with pytest.raises(RuntimeError):
+        export.export_animation(fig, broken, 4, str(tmp_path / 'anim.gif'), workers=1, dpi=40)
+    assert os.listdir(tempfile.tempdir) == []
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import mechanism
+import sweep
+from common.grid import cartesian
+
+
+def test_cartesian_product_over_defaults():
+    grid = cartesian({'a': 1, 'b': 2, 'c': 3}, a=[10, 20], c=[5, 6, 7])
+    assert np.array_equal(grid['a'], [10, 10, 10, 20, 20, 20])  # первая ось - самая медленная
+    assert np.array_equal(grid['c'], [5, 6, 7, 5, 6, 7])
+    assert np.array_equal(grid['b'], np.full(6, 2.0))
+    assert {k: v.tolist() for k, v in cartesian({'a': 1}).items()} == {'a': [1.0]}
+
+
+def test_unknown_axis_rejected():
+    with pytest.raises(ValueError):
+        cartesian({'a': 1}, d=[1, 2])
+
+
+def test_lab_grids_use_their_defaults():
+    design = mechanism.make_grid(SA=np.linspace(0.1, 0.5, 5), Y0=[2, 2.3])
+    assert set(design) == set(mechanism.DEFAULTS) and len(design['RB']) == 10
+    assert np.all(design['RB'] == mechanism.DEFAULTS['RB'])
+
+    params = sweep.make_grid(c=[20, 80])
+    assert set(params) == set(sweep.DEFAULTS)
+    assert np.array_equal(params['m'], [10, 10])
+    with pytest.raises(ValueError):
+        mechanism.make_grid(c=[1])
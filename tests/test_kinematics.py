@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+import pytest
+
+import kinematics
+
+R_LAW, PHI_LAW = '1 + sin(t)', 't'
+
+
+@pytest.fixture
+def cardioid(tmp_path):
+    return kinematics.load(R_LAW, PHI_LAW, cache_dir=str(tmp_path))
+
+
+def test_kernel_matches_substitution(cardioid):
+    # Грубая сетка, включающая точку возврата t = 3π/2 (радиус кривизны там не определен)
+    exprs, kernel = cardioid
+    T = np.linspace(0, 2 * np.pi, 13)
+    assert kinematics.check_kernel(kernel, exprs, T) <= kinematics.KERNEL_TOL
+
+
+def test_check_kernel_rejects_nan(cardioid):
+    exprs, kernel = cardioid
+
+    def broken(T):
+        out = kernel(T)
+        out[0, 1] = np.nan
+        return out
+
+    with pytest.raises(ValueError):
+        kinematics.check_kernel(broken, exprs, np.linspace(0, 1, 5))
+
+
+def test_cache_hit_returns_same_kernel(tmp_path):
+    _, first = kinematics.load(R_LAW, PHI_LAW, cache_dir=str(tmp_path))
+    _, second = kinematics.load(R_LAW, PHI_LAW, cache_dir=str(tmp_path))
+    T = np.linspace(0, 1, 50)
+    np.testing.assert_array_equal(first(T), second(T))
+
+
+def test_shared_cache_directory_is_not_executed(tmp_path):
+    # Подмененная запись исполняется из собственного каталога, но не из доступного другим
+    kinematics.load(R_LAW, PHI_LAW, cache_dir=str(tmp_path))
+    path = tmp_path / (kinematics.cache_key(R_LAW, PHI_LAW) + '.json')
+    entry = json.loads(path.read_text())
+    entry['source'] = 'raise RuntimeError("executed")\n' + entry['source']
+    path.write_text(json.dumps(entry))
+    with pytest.raises(RuntimeError, match='executed'):
+        kinematics.load(R_LAW, PHI_LAW, cache_dir=str(tmp_path))
+
+    tmp_path.chmod(0o777)
+    with pytest.warns(UserWarning):
+        _, kernel = kinematics.load(R_LAW, PHI_LAW, cache_dir=str(tmp_path))
+    assert kernel(np.array([0.0])).shape == (len(kinematics.COLUMNS), 1)
+
+
+@pytest.mark.parametrize('tol', [1e-3, 1e-5, 1e-6])
+def test_adaptive_times_bound_holds_on_dense_probe(cardioid, tol):
+    # Ломаная не отходит от траектории дальше tol, в том числе у точки возврата t = 3π/2
+    _, kernel = cardioid
+    T = kinematics.adaptive_times(kernel, 0, 2 * np.pi, tol)
+    assert np.any(np.abs(T - 1.5 * np.pi) < 1e-9)
+    probe = np.linspace(0, 1, 513)[1:-1]
+    assert kinematics._max_deviation(kernel, T, probe).max() <= tol
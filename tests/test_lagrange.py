@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from dynamics import MotionEquations, reactions
+from lagrange import LagrangeModel
+
+PARAMS = (1, 10, 1, 0.4, 50, 9.81)  # M, m, l, r, c, g как в l3.py
+
+
+@pytest.fixture(scope='module')
+def model():
+    return LagrangeModel()
+
+
+@pytest.fixture(scope='module')
+def states():
+    rng = np.random.default_rng(1)
+    return rng.uniform(-1, 1, (4, 50)) * np.array([[0.1], [np.pi / 2], [1], [3]])
+
+
+def test_rhs_matches_motion_equations(model, states):
+    rhs = MotionEquations(*PARAMS)
+    assert np.allclose(model.rhs(states, 0, *PARAMS), rhs(states), rtol=1e-12, atol=1e-12)
+    assert np.allclose(model.rhs(states[:, 0], 0, *PARAMS), rhs(states[:, 0]), rtol=1e-12, atol=1e-12)
+
+
+def test_jac_matches_motion_equations(model, states):
+    rhs = MotionEquations(*PARAMS)
+    jac = model.jac(states, 0, *PARAMS)
+    for k in range(states.shape[1]):
+        assert np.allclose(jac[..., k], rhs.jac(states[:, k]), rtol=1e-12, atol=1e-12)
+
+
+def test_reactions_match_dynamics(model, states):
+    expected = reactions(states, MotionEquations(*PARAMS)(states), *PARAMS)
+    assert np.allclose(model.reactions(states, 0, *PARAMS), expected, rtol=1e-12, atol=1e-10)
+
+
+def test_parameter_arrays(model, states):
+    c = np.linspace(20, 80, states.shape[1])
+    expected = MotionEquations(*PARAMS[:4], c, PARAMS[5])(states)
+    assert np.allclose(model.rhs(states, 0, *PARAMS[:4], c, PARAMS[5]), expected, rtol=1e-12, atol=1e-12)
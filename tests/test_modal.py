@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+import modal
+from dense import DenseSolution
+
+PARAMS = (1, 10, 1, 0.4, 50, 9.81)  # M, m, l, r, c, g как в l3.py
+T = np.linspace(0, 6 * np.pi, 1500)
+
+
+@pytest.mark.parametrize('y0', [[1e-3, 1e-3, 0, 0], [0, 1e-2, 0, 0], [5e-3, 0, 0, 0.01]])
+def test_estimate_tracks_actual_error(y0):
+    result = modal.compare(*PARAMS, y0, T)
+    assert result['error_estimate'] == pytest.approx(result['error'], rel=0.05)
+
+
+def test_small_amplitude_uses_modal_solution():
+    y0 = [1e-3, 1e-3, 0, 0]
+    states, info = modal.solve(*PARAMS, y0, T)
+    assert info['method'] == 'modal'
+    reference = DenseSolution(*PARAMS, y0, T[0], T[-1]).states(T)
+    assert np.abs(states - reference).max() < modal.LINEAR_TOL
+
+
+def test_large_amplitude_falls_back_to_nonlinear():
+    y0 = [0.02, np.pi / 6, 0, 0]  # начальные условия l3.py
+    states, info = modal.solve(*PARAMS, y0, T)
+    assert info['method'] == 'nonlinear' and info['error_estimate'] > modal.LINEAR_TOL
+    assert np.allclose(states[:, 0], y0)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from common import playback
+
+
+def fake_clock(ticks):
+    # Настенное время - заданная последовательность показаний
+    ticks = iter(ticks)
+    return lambda: next(ticks)
+
+
+def test_frames_skip_to_wall_time():
+    times = np.arange(11.0)  # кадры 0..10 с шагом 1 с
+    clock = playback.PlaybackClock(times, clock=fake_clock([0, 0, 0.5, 3.2, 9.9, 12]))
+    assert list(clock.frames()) == [0, 0, 3, 9, 10]
+    assert clock.dropped == 2 + 5
+    assert clock.shown == 4
+
+
+def test_interpolated_positions_index_through_lerp():
+    times = np.array([0.0, 1.0, 3.0])
+    clock = playback.PlaybackClock(times, speed=0.5, interpolate=True,
+                                   clock=fake_clock([0, 1, 3, 10]))
+    positions = list(clock.frames())
+    assert np.allclose(positions, [0.5, 1.25, 2])
+
+    values = np.array([[0.0, 0.0], [2.0, 1.0], [6.0, 5.0]])
+    rows = [playback.lerp(values, p) for p in positions]
+    assert np.allclose(rows, [[1.0, 0.5], [3.0, 2.0], [6.0, 5.0]])
+    assert np.array_equal(playback.lerp(values, 1), values[1])
+
+
+def test_lerp_without_allocation():
+    values = np.arange(12.0).reshape(4, 3)
+    row = playback.lerp(values, 2)
+    assert np.shares_memory(row, values) and np.array_equal(row, values[2])
+    assert np.array_equal(playback.lerp(values, 3.0), values[3])
+
+    out = np.empty(3)
+    assert playback.lerp(values, 1.25, out) is out
+    assert np.allclose(out, values[1] + 0.25 * (values[2] - values[1]))
+
+
+def test_uniform_positions_follow_time():
+    times = np.array([0.0, 0.1, 0.2, 1.0, 2.0])  # отсчеты сгущаются в начале
+    positions = playback.uniform_positions(times, fps=4)
+    assert len(positions) == 9 and positions[0] == 0 and positions[-1] == len(times) - 1
+    sampled = [float(playback.lerp(times, p)) for p in positions]
+    assert np.allclose(sampled, np.linspace(0, 2, 9))
+    assert len(playback.uniform_positions(times, fps=4, speed=2)) == 5
@@ -0,0 +1,28 @@
+import numpy as np
+
+from common.ringbuffer import RingBuffer
+
+
+def test_view_keeps_last_samples_in_order():
+    ring = RingBuffer(5, 2)
+    seen = []
+    for start, k in [(0, 3), (3, 1), (4, 4), (8, 12), (20, 2)]:
+        block = np.stack([np.arange(start, start + k), -np.arange(start, start + k)])
+        ring.extend(block)
+        seen.extend(range(start, start + k))
+        expected = np.array(seen[-5:], dtype=float)
+        view = ring.view()
+        assert ring.size == len(expected)
+        assert np.array_equal(view[0], expected) and np.array_equal(view[1], -expected)
+
+
+def test_view_is_contiguous_and_clear_resets():
+    ring = RingBuffer(4, 1)
+    ring.extend([[1, 2, 3, 4, 5, 6]])
+    view = ring.view()
+    assert view.strides[1] == view.itemsize  # отсчеты идут подряд, в порядке времени
+    assert np.shares_memory(view, ring._data)  # без копирования
+    ring.clear()
+    assert ring.view().shape == (1, 0)
+    ring.extend([[7]])
+    assert ring.view().tolist() == [[7.0]]
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+import solvers
+
+Y0 = [0.02, np.pi / 6, 0, 0]
+
+
+def params(m, c):
+    return 1, m, 1, 0.4, c, 9.81  # M, m, l, r, c, g
+
+
+@pytest.mark.parametrize('m, c, expected', [
+    (10, 50, solvers.NONSTIFF),  # как в l3.py
+    (0.1, 50, solvers.NONSTIFF),  # как в l3_with_graphs.py
+    (0.1, 5e4, solvers.SWITCHING),
+    (0.1, 5e7, solvers.SWITCHING),
+])
+def test_select_method(m, c, expected):
+    assert solvers.select_method(*params(m, c), Y0) == expected
+
+
+def test_auto_solution_matches_explicit():
+    t = np.linspace(0, 1, 20)
+    auto = solvers.solve(*params(0.1, 5e4), Y0, 0, 1, rtol=1e-9, atol=1e-12)
+    reference = solvers.solve(*params(0.1, 5e4), Y0, 0, 1, method='DOP853', rtol=1e-11, atol=1e-13)
+    assert np.abs(auto.states(t) - reference.states(t)).max() < 1e-6
@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+
+import storage
+from dynamics import MotionEquations
+
+PARAMS = (1, 10, 1, 0.4, 50, 9.81)  # M, m, l, r, c, g как в l3.py
+Y0 = [0.02, np.pi / 6, 0, 0]
+
+
+@pytest.mark.parametrize('n, segment', [(201, storage.SEGMENT), (201, 7), (2, 1)])
+def test_file_matches_odeint(tmp_path, n, segment):
+    path = str(tmp_path / 'run.bin')
+    storage.simulate_to_file(path, *PARAMS, Y0, 0, 4, n, segment=segment, chunk=16)
+    header, data = storage.open_run(path)
+    t = storage.time_grid(header)
+    assert data.shape == (n, len(storage.COLUMNS)) and len(t) == n
+    assert t[0] == 0 and t[-1] == pytest.approx(4)
+
+    rhs = MotionEquations(*PARAMS)
+    reference = odeint(rhs, Y0, t, Dfun=rhs.jac, rtol=1e-11, atol=1e-12)
+    assert np.abs(data[:, :4] - reference).max() < 1e-6
+    assert np.array_equal(storage.time_grid(header, 1, 2), t[1:2])
+
+
+@pytest.mark.parametrize('n', [1, 0, -3, 2.5])
+def test_grid_size_checked_before_writing(tmp_path, n):
+    path = str(tmp_path / 'run.bin')
+    with pytest.raises(ValueError):
+        storage.simulate_to_file(path, *PARAMS, Y0, 0, 4, n)
+    assert not os.path.exists(path)
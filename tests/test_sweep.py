@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+
+import sweep
+from dynamics import MotionEquations, reactions
+
+T = np.linspace(0, 2, 41)
+
+
+@pytest.fixture(scope='module')
+def grid():
+    return sweep.make_grid(c=[40, 60], phi0=[0.2, 0.5])
+
+
+@pytest.fixture(scope='module')
+def direct(grid):
+    # Поточечное решение odeint: величины FIELDS формы (n_points, len(FIELDS), len(T))
+    rows = []
+    for j in range(len(grid['c'])):
+        params = [grid[k][j] for k in sweep.PARAMS]
+        rhs = MotionEquations(*params)
+        y0 = [grid['x0'][j], grid['phi0'][j], grid['dx0'][j], grid['dphi0'][j]]
+        S = odeint(rhs, y0, T, Dfun=rhs.jac, rtol=1e-11, atol=1e-12).T
+        N_eps, N_nu = reactions(S, rhs(S), *params)
+        rows.append([S[0], S[1], N_eps, N_nu])
+    return np.array(rows)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_matches_direct_solve(grid, direct, workers):
+    data, stats = sweep.run_sweep(grid, T, workers=workers, batch=3)
+    assert data.shape == (4, len(sweep.FIELDS), len(T))
+    scale = np.abs(direct).max(axis=(0, 2))[None, :, None]
+    assert np.abs((data - direct) / scale).max() < 1e-5
+
+    N_nu, phi = direct[:, 3], direct[:, 1]
+    expected = np.stack([np.abs(N_nu).max(axis=1), N_nu.min(axis=1), phi.max(axis=1)], axis=1)
+    assert np.allclose(stats, expected, rtol=1e-5)
+
+
+def test_layout_in_given_file_and_stats_only(grid, tmp_path):
+    path = str(tmp_path / 'sweep.bin')
+    data, stats = sweep.run_sweep(grid, T, path=path, fields=('phi', 'x'), workers=1, batch=3)
+    stored = np.memmap(path, dtype=np.float64, mode='r', shape=(4, 2, len(T)))
+    assert np.array_equal(stored, data)
+    full, _ = sweep.run_sweep(grid, T, workers=1, batch=3)  # шаг общий для пакета
+    assert np.array_equal(stored[:, 0], full[:, 1]) and np.array_equal(stored[:, 1], full[:, 0])
+
+    none, only = sweep.run_sweep(grid, T, fields=(), workers=1, batch=3)
+    assert none is None and np.array_equal(only, stats)
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')  # деление на c = 0 в MotionEquations
+def test_degenerate_point_does_not_stall():
+    data, stats = sweep.run_sweep(sweep.make_grid(c=[0, 50]), T, workers=1)
+    assert np.all(np.isnan(stats[0])) and np.all(np.isfinite(stats[1]))
@@ -0,0 +1,49 @@
+import matplotlib
+import numpy as np
+import pytest
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plot  # noqa: E402
+
+from common.timeseries import DecimatedLine, ProgressiveLine  # noqa: E402
+
+
+@pytest.fixture
+def axes():
+    fig, ax = plot.subplots(figsize=(4, 2), dpi=100)
+    yield fig, ax
+    plot.close(fig)
+
+
+def test_width_taken_after_layout(axes):
+    fig, ax = axes
+    series = DecimatedLine(ax.plot([], [])[0], 0, 1)
+    fig.set_size_inches(8, 2)  # компоновка меняется после создания ряда
+    fig.tight_layout()
+    series.extend([0.0, 0.5], [1.0, 2.0])
+    assert series.n == int(ax.bbox.width) > 600
+
+
+def test_extremes_kept_and_points_bounded(axes):
+    fig, ax = axes
+    t = np.linspace(0, 10, 100001)
+    y = np.sin(3 * t) + 0.01 * np.cos(517 * t)
+    y[31337] = 5.0  # одиночный пик
+    series = ProgressiveLine(ax.plot([], [])[0], t, y, buckets=50)
+    for i in (1000, 40000, 100001):
+        series.show(i)
+    x_line, y_line = series.line.get_data()
+    assert len(x_line) <= 2 * 50 and np.all(np.diff(x_line) >= 0)
+    assert y_line.max() == 5.0 and y_line.min() == y.min()
+
+
+def test_show_is_independent_of_history(axes):
+    fig, ax = axes
+    t = np.linspace(0, 1, 1000)
+    y = np.cos(40 * t)
+    a = ProgressiveLine(ax.plot([], [])[0], t, y, buckets=30)
+    b = ProgressiveLine(ax.plot([], [])[0], t, y, buckets=30)
+    for i in (900, 120, 700):
+        a.show(i)
+    b.show(700)
+    assert all(np.array_equal(p, q) for p, q in zip(a.line.get_data(), b.line.get_data()))